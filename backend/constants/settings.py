@@ -1,6 +1,7 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     STAGE: str = os.getenv("ENV", "development")
@@ -11,6 +12,43 @@ class Settings(BaseSettings):
     SUPABASE_JWT_SECRET: str   
     BUCKET_NAME: str 
 
+    # Seconds an exact listing count stays cached per filter combination
+    COUNT_CACHE_TTL: int = 30
+
+    # Serialized GET /tutors/{tutor_id} responses kept per process
+    TUTOR_CACHE_TTL: int = 300
+    TUTOR_CACHE_MAXSIZE: int = 2048
+
+    # Connection pooling, see database/pool.py for the available modes
+    DB_POOL_MODE: str = "auto"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 10
+    DB_POOL_RECYCLE: int = 300
+
+    # Decoded JWT claims cached per process until the token's exp
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAXSIZE: int = 10000
+
+    # GET /users/profile responses cached per user; 0 disables the cache
+    PROFILE_CACHE_TTL: int = 30
+    PROFILE_CACHE_MAXSIZE: int = 5000
+
+    # status_detail / role_detail snapshot lifetime in seconds
+    REFERENCE_DATA_TTL: int = 3600
+
+    # Session request events: fan out across workers through Postgres LISTEN/NOTIFY.
+    # LISTEN needs a session-mode connection; set SESSION_EVENTS_DATABASE_URL when
+    # DATABASE_URL goes through a transaction-mode pooler.
+    SESSION_EVENTS_BACKPLANE: bool = True
+    SESSION_EVENTS_DATABASE_URL: Optional[str] = None
+    SESSION_EVENTS_KEEPALIVE: int = 15
+
+    # Cache-Control sent with ETag-validated reads
+    CACHE_CONTROL_TUTOR_LIST: str = "public, max-age=0, must-revalidate"
+    CACHE_CONTROL_TUTOR_DETAIL: str = "public, max-age=0, must-revalidate"
+    CACHE_CONTROL_PROFILE: str = "private, no-cache"
+
     model_config = SettingsConfigDict(env_file=f".env.{STAGE}" if os.path.exists(f".env.{STAGE}") else ".env")
     
 @lru_cache
@@ -1,15 +1,43 @@
-# Description: This file initializes the supabase client using the credentials fetched from the .env file.
-from supabase import create_client, Client
+# Description: This file initializes the supabase clients using the credentials fetched from the .env file.
+# The clients are created on first use so that importing a router does not pay for
+# importing the supabase package and building both clients on every cold start.
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from . import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 SETTINGS = settings.get_settings()
 
+@lru_cache
+def get_supabase() -> "Client":
+    """
+    Supabase client with the anon key.
+    """
+    from supabase import create_client
+    return create_client(SETTINGS.SUPABASE_URL, SETTINGS.SUPABASE_KEY)
+
+@lru_cache
+def get_supabase_admin() -> "Client":
+    """
+    Supabase client with the service role key.
+    """
+    from supabase import create_client
+    return create_client(SETTINGS.SUPABASE_URL, SETTINGS.SUPABASE_SERVICE_ROLE_KEY)
+
+class _LazyClient:
+    """
+    Stand-in that builds the real client on first attribute access.
+    """
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
 # Initialize supabase client
-supabase: Client = create_client(
-    SETTINGS.SUPABASE_URL, 
-    SETTINGS.SUPABASE_KEY)
+supabase: "Client" = _LazyClient(get_supabase)
 
 # Initialize supabase client with service role
-supabase_admin: Client = create_client(
-    SETTINGS.SUPABASE_URL, 
-    SETTINGS.SUPABASE_SERVICE_ROLE_KEY)
+supabase_admin: "Client" = _LazyClient(get_supabase_admin)
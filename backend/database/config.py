@@ -1,18 +1,57 @@
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from constants import settings
+from .pool import engine_options, instrument_engine, resolve_pool_mode
 
 SETTINGS = settings.get_settings()
 
-engine = create_engine(SETTINGS.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engines are created on first use, so cold starts that never touch the
+# database (e.g. token refresh) skip building them and loading the drivers.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+@lru_cache
+def get_engine():
+    engine = create_engine(SETTINGS.DATABASE_URL, **engine_options(SETTINGS, "sync"))
+    instrument_engine(engine, "sync")
+    return engine
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
         db.close()
-    
+
+def async_database_url(database_url: str, pool_mode: str):
+    """
+    Derive the asyncpg URL from DATABASE_URL. asyncpg does not understand libpq's
+    sslmode query parameter, so it is moved into connect_args.
+    """
+    url = make_url(database_url)
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    connect_args = {"ssl": sslmode} if sslmode and sslmode != "disable" else {}
+    if pool_mode == "null":
+        # External poolers in transaction mode cannot keep prepared statements
+        connect_args["statement_cache_size"] = 0
+        query["prepared_statement_cache_size"] = "0"
+    return url.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+# Async engine for `async def` handlers, so queries do not block the event loop
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+@lru_cache
+def get_async_engine():
+    url, connect_args = async_database_url(SETTINGS.DATABASE_URL, resolve_pool_mode(SETTINGS.DB_POOL_MODE))
+    engine = create_async_engine(url, connect_args=connect_args, **engine_options(SETTINGS, "async", is_async=True))
+    instrument_engine(engine, "async")
+    return engine
+
+async def get_async_db():
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
@@ -0,0 +1,119 @@
+# Description: Connection pool strategies and instrumentation for the database engines.
+#
+#   null   - no pooling in the app; use behind an external pooler (Supabase/pgbouncer)
+#   lambda - a single pre-pinged connection per engine, reused across warm invocations
+#   server - a sized QueuePool for long-running uvicorn workers
+#   auto   - lambda when running on AWS Lambda, server otherwise
+import os
+import time
+from threading import Lock
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
+from constants.logger import logger
+
+POOL_MODES = ("auto", "null", "lambda", "server")
+
+class PoolMetrics:
+    """
+    Counters for one engine's pool: checkout latency, new physical connections
+    and checkouts that failed because the pool was exhausted.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.connects = 0
+        self.exhausted = 0
+        self._lock = Lock()
+
+    def record_checkout(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_exhausted(self):
+        with self._lock:
+            self.exhausted += 1
+
+    def stats(self, pool) -> dict:
+        with self._lock:
+            return {
+                "pool": type(pool).__name__,
+                "status": pool.status(),
+                "checkouts": self.checkouts,
+                "checkout_ms_avg": round(self.checkout_seconds_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                "checkout_ms_max": round(self.checkout_seconds_max * 1000, 3),
+                "connects": self.connects,
+                "exhausted": self.exhausted,
+            }
+
+_engines: dict = {}
+
+class _TimedPoolMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_exhausted()
+            logger.warning(f"Database pool '{self.metrics.name}' exhausted: {self.status()}")
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+def resolve_pool_mode(mode: str) -> str:
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}, got '{mode}'")
+    if mode == "auto":
+        return "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") or os.getenv("AWS_EXECUTION_ENV") else "server"
+    return mode
+
+def engine_options(settings, name: str, is_async: bool = False) -> dict:
+    """
+    Keyword arguments for create_engine/create_async_engine for the configured
+    pool mode. `name` identifies the engine in pool metrics.
+    """
+    mode = resolve_pool_mode(settings.DB_POOL_MODE)
+    metrics = PoolMetrics(name)
+
+    if mode == "null":
+        base = NullPool
+        options = {}
+    else:
+        base = AsyncAdaptedQueuePool if is_async else QueuePool
+        options = {
+            "pool_pre_ping": True,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        }
+        if mode == "lambda":
+            # One invocation at a time per container, so one connection is enough
+            options.update(pool_size=1, max_overflow=0)
+        else:
+            options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+
+    # A class per engine keeps the metrics attached when the pool is recreated
+    options["poolclass"] = type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics": metrics})
+    logger.info(f"Database engine '{name}' using {mode} pool mode")
+    return options
+
+def instrument_engine(engine, name: str):
+    """
+    Register an engine (sync or async) so its pool shows up in pool_stats().
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = sync_engine.pool.metrics
+    event.listen(sync_engine, "connect", lambda dbapi_connection, record: metrics.record_connect())
+    _engines[name] = sync_engine
+
+def pool_stats() -> dict:
+    return {name: engine.pool.metrics.stats(engine.pool) for name, engine in _engines.items()}
@@ -1,6 +1,5 @@
 from fastapi import FastAPI
-from models import *
-from router import auth_login, auth_signup, user_router, session_router, tutor_router
+from router import auth_login, auth_signup, user_router, session_router, tutor_router, system_router, events_router
 from mangum import Mangum
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -12,13 +11,16 @@ app.include_router(auth_signup)
 app.include_router(user_router)
 app.include_router(session_router)
 app.include_router(tutor_router)
+app.include_router(system_router)
+app.include_router(events_router)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"]
 )
 
 print("🚀 Initializing backend... ")
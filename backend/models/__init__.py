@@ -8,6 +8,7 @@ from .user.role_detail import RoleDetail
 from .user.user_detail import UserDetail
 from .user.user_role_detail import UserRoleDetail
 from .user.status_detail import StatusDetail
+from .user.pending_signup import PendingSignup
 
 # Subject models
 from .subject.subject_offered import SubjectOffered
@@ -29,4 +30,5 @@ from .tutor.detail import TutorDetail
 from .tutor.availability import TutorAvailability
 from .tutor.affiliation import TutorAffiliation
 from .tutor.expertise import TutorExpertise
-from .tutor.socials import TutorSocials
\ No newline at end of file
+from .tutor.socials import TutorSocials
+from .tutor.directory import TutorDirectory, TutorDirectoryVersion
\ No newline at end of file
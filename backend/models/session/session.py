@@ -1,18 +1,37 @@
-from sqlalchemy import Column, ForeignKey, Integer, Date, Time, String
+from sqlalchemy import Column, ForeignKey, Integer, Date, Time, String, Index, text
 from models import Base
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.orm import relationship
 
+# Status id of a pending request, fixed by the partial unique index below
+PENDING_STATUS_ID = 0
+
 class Session(Base):
     __tablename__ = "session"
+    __table_args__ = (
+        # Pending requests per tutor, in the order GET /tutors/requests pages through them
+        Index("ix_session_tutor_id_status_date_time", "tutor_id", "status", "date", "time"),
+        # A student's sessions, and the admin listing of sessions by status
+        Index("ix_session_student_id_date_time", "student_id", "date", "time"),
+        Index("ix_session_status_date_time", "status", "date", "time", "session_id"),
+        # At most one pending request per slot; request_session relies on it for ON CONFLICT.
+        # Rows left over from the old racy check must go first: python -m scripts.dedupe_pending_requests
+        Index(
+            "uq_session_pending_request",
+            "tutor_id", "student_id", "topic_id", "date", "time",
+            unique=True,
+            postgresql_where=text(f"status = {PENDING_STATUS_ID}"),
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     session_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     date = Column(Date, nullable=False)
     time = Column(Time, nullable=False)
     tutor_id = Column(UUID(as_uuid=True), ForeignKey("tutor_detail.tutor_id"), nullable=False)
     student_id = Column(UUID(as_uuid=True), ForeignKey("student_detail.student_id"), nullable=False)
-    topic_id = Column(UUID(as_uuid=True), ForeignKey("topic_detail.topic_id"), nullable=True)
+    topic_id = Column(UUID(as_uuid=True), ForeignKey("topic_detail.topic_id"), nullable=True, index=True)
     status = Column(Integer, ForeignKey("status_detail.status_id"), nullable=False)
     time_started = Column(Time, nullable=True)
     time_ended = Column(Time, nullable=True)
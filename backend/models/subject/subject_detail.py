@@ -8,6 +8,6 @@ class SubjectDetail(Base):
 
     subject_id = Column(UUID(as_uuid=True), primary_key=True, index=True, server_default=text("gen_random_uuid()"))
     subject_name = Column(String, nullable=False)
-    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), nullable=False)
+    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), nullable=False, index=True)
 
     user = relationship("UserDetail", back_populates="subject_detail")
@@ -7,5 +7,5 @@ class TopicDetail(Base):
     __tablename__ = "topic_detail"
 
     topic_id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=uuid.uuid4)
-    subject_id = Column(UUID(as_uuid=True), ForeignKey("subject_detail.subject_id"), nullable=False)
+    subject_id = Column(UUID(as_uuid=True), ForeignKey("subject_detail.subject_id"), nullable=False, index=True)
     topic_title = Column(String, nullable=True)
\ No newline at end of file
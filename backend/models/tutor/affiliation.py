@@ -8,7 +8,7 @@ class TutorAffiliation(Base):
     __tablename__ = "tutor_affiliation"
 
     tutor_affiliation_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"))
+    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), index=True)
     affiliations = Column(String, nullable=True)
 
     user = relationship("UserDetail", back_populates="tutor_affiliation")
@@ -8,7 +8,7 @@ class TutorDetail(Base):
 
     tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), primary_key=True)
     description = Column(String, nullable=False)
-    status = Column(Integer, ForeignKey("status_detail.status_id"))
+    status = Column(Integer, ForeignKey("status_detail.status_id"), index=True)
 
     # Relationships - user_detail
     user = relationship("UserDetail", back_populates="tutor_detail")
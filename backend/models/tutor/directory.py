@@ -0,0 +1,41 @@
+# Description: Denormalized read model of the tutor directory. One row per tutor holding
+# every list attribute as a pre-aggregated array; kept up to date by services/tutor_directory.py.
+from sqlalchemy import Column, ForeignKey, String, Integer, BigInteger, Date, Time, DateTime, Index, func
+from models import Base
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+
+class TutorDirectory(Base):
+    __tablename__ = "tutor_directory"
+    __table_args__ = (
+        Index("ix_tutor_directory_datejoined_tutor_id", "datejoined", "tutor_id"),
+        Index("ix_tutor_directory_status", "status"),
+        Index("ix_tutor_directory_expertise", "expertise", postgresql_using="gin"),
+    )
+
+    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid", ondelete="CASCADE"), primary_key=True)
+    name = Column(String, nullable=True)
+    email = Column(String, nullable=False)
+    datejoined = Column(Date, nullable=False)
+    description = Column(String, nullable=True)
+    status = Column(Integer, nullable=True)
+    subject = Column(ARRAY(String), nullable=True)
+    topic_title = Column(ARRAY(String), nullable=True)
+    topic_id = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
+    affiliations = Column(ARRAY(String), nullable=True)
+    availability = Column(ARRAY(Date), nullable=True)
+    available_time_from = Column(ARRAY(Time), nullable=True)
+    available_time_to = Column(ARRAY(Time), nullable=True)
+    expertise = Column(ARRAY(String), nullable=True)
+    socials = Column(ARRAY(String), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class TutorDirectoryVersion(Base):
+    """
+    Single-row counter bumped by every directory refresh. The row lock orders
+    concurrent refreshes by commit, so the version only ever moves forward as
+    readers see it; the directory ETag is derived from it.
+    """
+    __tablename__ = "tutor_directory_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -8,7 +8,7 @@ class TutorExpertise(Base):
     __tablename__ = "tutor_expertise"
 
     tutor_expertise_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), nullable=False)
+    tutor_id = Column(UUID(as_uuid=True), ForeignKey("user_detail.userid"), nullable=False, index=True)
     expertise = Column(String, nullable=False)
 
     user = relationship("UserDetail", back_populates="tutor_expertise")
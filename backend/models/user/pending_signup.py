@@ -0,0 +1,13 @@
+# Description: Auth users that signed up but have no user_detail row yet. Lets signup and
+# email verification resolve an email to its Supabase user id with an indexed lookup.
+from sqlalchemy import Column, String, DateTime, func
+from models import Base
+from sqlalchemy.dialects.postgresql import UUID
+
+class PendingSignup(Base):
+    __tablename__ = "pending_signup"
+
+    # Stored lower-cased so lookups are case-insensitive
+    email = Column(String, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), unique=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
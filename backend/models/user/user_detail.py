@@ -1,5 +1,5 @@
 # Description: This file contains the ORM model for the UserDetail table that will be used to create the table in the database.
-from sqlalchemy import Column, Date, String
+from sqlalchemy import Column, Date, String, Index, text
 from models import Base
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -8,6 +8,12 @@ from sqlalchemy.orm import relationship
 # Define ORM model
 class UserDetail(Base):
     __tablename__ = "user_detail"
+    __table_args__ = (
+        # Backs keyset pagination of the tutor directory
+        Index("ix_user_detail_datejoined_userid", "datejoined", "userid"),
+        # Case-insensitive email lookups during signup and verification
+        Index("ix_user_detail_email_lower", text("lower(email)")),
+    )
 
     userid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=True)
@@ -17,8 +23,9 @@ class UserDetail(Base):
 
     # Relationships - tutor and user_detail
     tutor_detail = relationship("TutorDetail", back_populates="user", uselist=False)
-    tutor_affiliation = relationship("TutorAffiliation", back_populates="user", uselist=False)
-    tutor_availability = relationship("TutorAvailability", back_populates="user", uselist=False)
-    tutor_expertise = relationship("TutorExpertise", back_populates="user", uselist=False)
-    tutor_socials = relationship("TutorSocials", back_populates="user", uselist=False)
-    subject_detail = relationship("SubjectDetail", back_populates="user", uselist=False)
+    # A tutor has many rows in each of these tables
+    tutor_affiliation = relationship("TutorAffiliation", back_populates="user")
+    tutor_availability = relationship("TutorAvailability", back_populates="user")
+    tutor_expertise = relationship("TutorExpertise", back_populates="user")
+    tutor_socials = relationship("TutorSocials", back_populates="user")
+    subject_detail = relationship("SubjectDetail", back_populates="user")
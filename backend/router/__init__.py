@@ -3,5 +3,7 @@ from .auth.signup import router as auth_signup
 from .user_route import router as user_router
 from .session_request import router as session_router
 from .tutor_route import router as tutor_router
+from .system_route import router as system_router
+from .events_route import router as events_router
 
-__all__ = ["auth_login", "auth_signup", "user_router", "session_router", "tutor_router"]
+__all__ = ["auth_login", "auth_signup", "user_router", "session_router", "tutor_router", "system_router", "events_router"]
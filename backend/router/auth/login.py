@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from constants.supabase_client import supabase
 from pydantic import BaseModel
-from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List
-from database.config import get_db
+from database.config import get_async_db
 from constants.logger import logger
-from models import UserRoleDetail, UserDetail
+from models import UserRoleDetail
 
 router = APIRouter()
 
@@ -36,7 +38,8 @@ class AdminLoginResponse(BaseModel):
 @router.post("/auth/login", response_model=LoginResponse)
 async def login(credentials: LoginRequest):
     try:
-        auth_response = supabase.auth.sign_in_with_password({
+        # The Supabase client is synchronous; keep it off the event loop
+        auth_response = await run_in_threadpool(supabase.auth.sign_in_with_password, {
             "email": credentials.email, 
             "password": credentials.password
         })
@@ -68,9 +71,9 @@ async def login(credentials: LoginRequest):
 
 
 @router.post("/auth/login/admin", response_model=AdminLoginResponse)
-async def login(credentials: LoginRequest, db: DBSession = Depends(get_db)):
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     try:
-        auth_response = supabase.auth.sign_in_with_password({
+        auth_response = await run_in_threadpool(supabase.auth.sign_in_with_password, {
             "email": credentials.email, 
             "password": credentials.password
         })
@@ -83,8 +86,8 @@ async def login(credentials: LoginRequest, db: DBSession = Depends(get_db)):
         uid = user.id
         
         # Query roles associated with the user
-        roles = db.query(UserRoleDetail.role_id).join(UserDetail).filter(UserDetail.userid == uid).all()
-        role_ids = [str(r.role_id) for r in roles]
+        roles = await db.scalars(select(UserRoleDetail.role_id).where(UserRoleDetail.user_id == uid))
+        role_ids = [str(role_id) for role_id in roles]
 
         if "2" not in role_ids:
             raise HTTPException(status_code=403, detail="User is not an admin.")
@@ -106,7 +109,7 @@ async def login(credentials: LoginRequest, db: DBSession = Depends(get_db)):
 @router.post("/auth/login/refresh", response_model=RefreshResponse)
 async def refresh_token(payload: RefreshRequest):
     try:
-        response = supabase.auth.refresh_session(payload.refresh_token)
+        response = await run_in_threadpool(supabase.auth.refresh_session, payload.refresh_token)
         session = response.session
 
         if not session:
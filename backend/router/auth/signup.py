@@ -1,10 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from database.config import get_db
 from sqlalchemy.orm import Session
-from models import UserDetail, StudentDetail, UserRoleDetail, TutorDetail, StatusDetail, TutorSocials, TutorAffiliation, TutorAvailability, TutorExpertise, SubjectDetail
+from sqlalchemy import func, select, delete, text
+from sqlalchemy.dialects.postgresql import insert
+from models import UserDetail, StudentDetail, UserRoleDetail, TutorDetail, TutorSocials, TutorAffiliation, TutorAvailability, TutorExpertise, SubjectDetail, PendingSignup
 from constants.supabase_client import supabase_admin, supabase # supabase for login/signup & supabase_admin for verification
 from schema import StudentSignupSchema, TutorSignupSchema
 from constants.logger import logger
+from services.tutor_directory import refresh_tutor_directory
+from services.row_sync import bulk_insert
+from services.reference_data import is_status, is_role
 from pydantic import BaseModel
 import traceback
 
@@ -21,12 +26,8 @@ def verify_email(payload: EmailPayload, db: Session = Depends(get_db)):
         logger.info(f"Starting email verification for: {email}")
         
         try:
-            # Make sure to use the service role key in your Supabase client
-            users = supabase_admin.auth.admin.list_users()
-            logger.info(f"Successfully retrieved users from Supabase")
-            
-            # Find user by email
-            user = next((u for u in users if u.email == email), None)
+            # Indexed local lookup of the user id, then a single targeted admin fetch
+            user = find_auth_user(email, db)
         except Exception as supabase_error:
             logger.error(f"Supabase admin API error: {str(supabase_error)}")
             raise HTTPException(
@@ -49,6 +50,7 @@ def verify_email(payload: EmailPayload, db: Session = Depends(get_db)):
             if existing_user_detail:
                 # If user already exists, update data
                 add_detail(user, role, db)
+                clear_pending_signup(user.email, db)
                 return {"message": "User profile updated.", "email": user.email}
 
             # Add user to user_detail table
@@ -65,6 +67,7 @@ def verify_email(payload: EmailPayload, db: Session = Depends(get_db)):
             
             # Add user to student or tutor table
             add_detail(user, role, db)
+            clear_pending_signup(user.email, db)
 
             return {"message": "Account was successfully created.", "email": user.email}
         else:
@@ -88,18 +91,8 @@ def add_detail(user, role, db):
                 create_student_profile(user, db)
             else:
                 # If student profile exists, make sure the role is set
-                existing_role = db.query(UserRoleDetail).filter(
-                    UserRoleDetail.user_id == user.id,
-                    UserRoleDetail.role_id == "0"
-                ).first()
-                
-                if not existing_role:
-                    try:
-                        db.add(UserRoleDetail(user_id=user.id, role_id="0"))
-                        db.commit()
-                    except Exception as e:
-                        logger.info(f"User role already exists, continuing: {str(e)}")
-                        db.rollback()
+                add_user_role(user.id, 0, db)
+                db.commit()
         except Exception as e:
             logger.error(f"Error processing student profile: {str(e)}")
             db.rollback()
@@ -111,23 +104,14 @@ def add_detail(user, role, db):
             # Check if tutor profile already exists
             existing_tutor = db.query(TutorDetail).filter(TutorDetail.tutor_id == user.id).first()
             if not existing_tutor:
-                # Query tutor status from status_detail table
-                tutor_status = db.query(StatusDetail).filter(StatusDetail.status_id == '0').first()
-                create_tutor_profile(user, db, tutor_status)
+                # New tutors start out pending (status 0) until an admin approves them
+                if not is_status(db, 0):
+                    raise ValueError("Status 0 not found in status table")
+                create_tutor_profile(user, db, 0)
             else:
                 # If tutor already exists, just update their role if needed
-                existing_role = db.query(UserRoleDetail).filter(
-                    UserRoleDetail.user_id == user.id,
-                    UserRoleDetail.role_id == "1"
-                ).first()
-                
-                if not existing_role:
-                    try:
-                        db.add(UserRoleDetail(user_id=user.id, role_id="1"))
-                        db.commit()
-                    except Exception as e:
-                        logger.info(f"User role already exists, continuing: {str(e)}")
-                        db.rollback()
+                add_user_role(user.id, 1, db)
+                db.commit()
         except Exception as e:
             # Log the error for debugging
             logger.error(f"Error processing tutor profile: {str(e)}")
@@ -142,120 +126,88 @@ def create_student_profile(user, db):
     )
 
     db.add(new_student_detail)
-    db.commit()
 
-    # Check if user_role already exists for this role
+    # Student profile and role are committed together
     try:
-        existing_role = db.query(UserRoleDetail).filter(
-            UserRoleDetail.user_id == user.id,
-            UserRoleDetail.role_id == "0"
-        ).first()
-        
-        # Only add user role if it doesn't exist
-        if not existing_role:
-            try:
-                new_user_role = UserRoleDetail(
-                    user_id = user.id,
-                    role_id = "0"
-                )
-                db.add(new_user_role)
-                db.commit()
-            except Exception as e:
-                logger.info(f"User role already exists, continuing: {str(e)}")
-                db.rollback()
+        add_user_role(user.id, 0, db)
+        db.commit()
     except Exception as e:
-        logger.error(f"Error checking student role: {str(e)}")
+        logger.error(f"Error creating student profile: {str(e)}")
         db.rollback()
         raise
 
-def create_tutor_profile(user, db, tutor_status):
-    new_tutor_detail = TutorDetail(
-        tutor_id = user.id,
-        status = tutor_status.status_id,
-        description = user.user_metadata.get("description")
-    )
+def add_user_role(user_id, role_id, db):
+    """
+    Give the user a role unless they already have it. Does not commit.
+    """
+    if not is_role(db, role_id):
+        raise ValueError(f"Role {role_id} not found in role table")
+    db.execute(insert(UserRoleDetail).values(user_id=user_id, role_id=role_id).on_conflict_do_nothing())
 
-    db.add(new_tutor_detail)
-    
-    # Commit the tutor record first to ensure it exists before adding related records
-    db.commit()
-    
-    # Insert affiliation
-    tutor_affiliation = user.user_metadata.get("affiliation", [])
-    for affiliation in tutor_affiliation:
-        new_tutor_affiliation = TutorAffiliation(
-            tutor_id = user.id,
-            affiliations = affiliation
-        )
-        db.add(new_tutor_affiliation)
-
-    # Insert expertise
-    tutor_expertise = user.user_metadata.get("expertise", [])
-    for expertise in tutor_expertise:
-        new_tutor_expertise = TutorExpertise(
-            tutor_id = user.id,
-            expertise = expertise
-        )
-        db.add(new_tutor_expertise)
-
-    # Insert socials
-    tutor_socials = user.user_metadata.get("socials", [])
-    for socials in tutor_socials:
-        new_tutor_socials = TutorSocials(
-            tutor_id = user.id,
-            socials = socials
-        )
-        db.add(new_tutor_socials)
-
-    # Commit again to save affiliations, expertise, and socials
-    db.commit()
+def create_tutor_profile(user, db, tutor_status_id):
+    """
+    Provision a tutor and all of their metadata as one unit of work. Each child
+    table gets a single multi-row INSERT and everything is committed once, so a
+    failure part-way leaves no half-provisioned tutor behind.
+    """
+    metadata = user.user_metadata
+    tutor_id = user.id
 
-    tutor_availability = user.user_metadata.get("availability", [])
-    available_time_from = user.user_metadata.get("available_time_from", [])
-    available_time_to = user.user_metadata.get("available_time_to", [])
-
-    for i in range(len(tutor_availability)):
-        new_tutor_availability = TutorAvailability(
-            tutor_id=user.id,
-            availability = tutor_availability[i],
-            available_time_from = available_time_from[i],
-            available_time_to = available_time_to[i]
-        )
-        db.add(new_tutor_availability)
-    
-    # Commit availability before adding subjects
-    db.commit()
+    try:
+        db.execute(insert(TutorDetail).values(
+            tutor_id = tutor_id,
+            status = tutor_status_id,
+            description = metadata.get("description")
+        ))
+
+        # Insert affiliation, expertise and socials
+        bulk_insert(db, TutorAffiliation, [
+            {"tutor_id": tutor_id, "affiliations": affiliation}
+            for affiliation in metadata.get("affiliation", [])
+        ])
+        bulk_insert(db, TutorExpertise, [
+            {"tutor_id": tutor_id, "expertise": expertise}
+            for expertise in metadata.get("expertise", [])
+        ])
+        bulk_insert(db, TutorSocials, [
+            {"tutor_id": tutor_id, "socials": socials}
+            for socials in metadata.get("socials", [])
+        ])
+
+        # Insert availability; the three lists are index-aligned
+        bulk_insert(db, TutorAvailability, [
+            {
+                "tutor_id": tutor_id,
+                "availability": availability,
+                "available_time_from": time_from,
+                "available_time_to": time_to
+            }
+            for availability, time_from, time_to in zip(
+                metadata.get("availability", []),
+                metadata.get("available_time_from", []),
+                metadata.get("available_time_to", [])
+            )
+        ])
+
+        # Insert subjects
+        bulk_insert(db, SubjectDetail, [
+            {"tutor_id": tutor_id, "subject_name": subject}
+            for subject in metadata.get("subject", [])
+        ])
+
+        # Add the tutor role unless the user already has it
+        add_user_role(tutor_id, 1, db)
+
+        # Publish the new tutor to the directory read model
+        refresh_tutor_directory(db, tutor_id)
 
-    tutor_subject = user.user_metadata.get("subject", [])
-    for subject in tutor_subject:
-        new_tutor_subject = SubjectDetail(
-            tutor_id=user.id,
-            subject_name=subject
-        )
-        db.add(new_tutor_subject)
-
-    # Check if user_role already exists for this role
-    existing_role = db.query(UserRoleDetail).filter(
-        UserRoleDetail.user_id == user.id,
-        UserRoleDetail.role_id == "1"
-    ).first()
-    
-    # Only add user role if it doesn't exist
-    if not existing_role:
-        try:
-            db.add(UserRoleDetail(user_id=user.id, role_id="1"))
-            db.commit()
-        except Exception as e:
-            # If we get an error when adding the role, it's likely because it already exists
-            # Just log it and continue - the role is already there
-            logger.info(f"User role already exists, continuing: {str(e)}")
-            db.rollback()
-    else:
-        # Final commit to save everything else if we didn't add a role
         db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
 @router.post("/auth/signup/student")
-def signup_student(payload: StudentSignupSchema, request: Request):
+def signup_student(payload: StudentSignupSchema, request: Request, db: Session = Depends(get_db)):
     method = request.method
     logger.info(f"HTTP method used: {method}")
     logger.info(f"Received payload: {payload}")
@@ -264,7 +216,7 @@ def signup_student(payload: StudentSignupSchema, request: Request):
         student = payload.student
 
         # Check if the user already exists
-        existing_user = get_existing_user(user)
+        existing_user = get_existing_user(user, db)
 
         # Update user role from existing email
         if existing_user:
@@ -295,7 +247,7 @@ def signup_student(payload: StudentSignupSchema, request: Request):
             return {"message": "Signup successful. Student is now a tutor."}
 
         else:
-            supabase.auth.sign_up({
+            response = supabase.auth.sign_up({
                 "email": user.email,
                 "password": user.password,
                 "options": {
@@ -307,6 +259,7 @@ def signup_student(payload: StudentSignupSchema, request: Request):
                     }
                 }
             })
+            record_pending_signup(response.user, db)
             return {"message": "Student registered successfully. Email verification sent."}
 
     except Exception as e:
@@ -315,7 +268,7 @@ def signup_student(payload: StudentSignupSchema, request: Request):
             raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/auth/signup/tutor")
-def signup_tutor(payload: TutorSignupSchema):
+def signup_tutor(payload: TutorSignupSchema, db: Session = Depends(get_db)):
     try:
         # Get payload
         user = payload.user
@@ -334,7 +287,7 @@ def signup_tutor(payload: TutorSignupSchema):
         available_time_to = [t.isoformat() for t in available_time_to]
 
         # Check if the user already exists
-        existing_user = get_existing_user(user)
+        existing_user = get_existing_user(user, db)
 
         if existing_user: 
             # Obtain the role
@@ -368,7 +321,7 @@ def signup_tutor(payload: TutorSignupSchema):
             )
             return {"message": "Signup successful. Tutor is also a student."}
         else:
-            supabase.auth.sign_up({
+            response = supabase.auth.sign_up({
                 "email": user.email,
                 "password": user.password,
                 "options": {
@@ -387,6 +340,7 @@ def signup_tutor(payload: TutorSignupSchema):
                     }
                 }
             })
+            record_pending_signup(response.user, db)
             
             return {"message": "Tutor registered successfully. Email verification sent."}
 
@@ -394,24 +348,58 @@ def signup_tutor(payload: TutorSignupSchema):
         logger.error(f"Signup failed. {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
-def get_existing_user(user):
+def get_existing_user(user, db):
     # Check if the user already exists
     """
     Check if the user already exists in supabase auth
     """
     try:
-        # Fetch all users 
-        response = supabase_admin.auth.admin.list_users()
-        user_list = response.users if hasattr(response, 'users') else response  # fallback for some clients
-        
-        # Look for matching email (case-insensitive just in case)
-        existing_user = next(
-            (u for u in user_list if u.email.lower() == user.email.lower()),
-            None
-        )
+        existing_user = find_auth_user(user.email, db)
     except Exception as e:
-        print("Error fetching users:", str(e))
+        logger.error(f"Error fetching user: {str(e)}")
         existing_user = None
 
     return existing_user
 
+def find_auth_user(email, db):
+    """
+    Resolve an email to its Supabase auth user. The user id comes from the indexed
+    user_detail and pending_signup tables; Supabase is only asked for that one id,
+    so the cost does not grow with the number of users.
+    """
+    email = email.strip().lower()
+
+    user_id = db.scalar(select(UserDetail.userid).where(func.lower(UserDetail.email) == email))
+    if user_id is None:
+        user_id = db.scalar(select(PendingSignup.user_id).where(PendingSignup.email == email))
+    if user_id is not None:
+        response = supabase_admin.auth.admin.get_user_by_id(str(user_id))
+        return response.user if response else None
+
+    # Fallback for auth users neither table knows about (signed up before pending_signup
+    # was backfilled, created in the dashboard, or whose pending row never committed):
+    # one lookup in Supabase's own auth schema, remembered for next time
+    user_id = db.scalar(text("SELECT id FROM auth.users WHERE lower(email) = :email"), {"email": email})
+    if user_id is None:
+        return None
+
+    response = supabase_admin.auth.admin.get_user_by_id(str(user_id))
+    user = response.user if response else None
+    record_pending_signup(user, db)
+    return user
+
+def record_pending_signup(auth_user, db):
+    """
+    Remember a new auth user until their email is verified and user_detail exists.
+    """
+    if auth_user is None:
+        return
+
+    stmt = insert(PendingSignup).values(email=auth_user.email.lower(), user_id=auth_user.id)
+    db.execute(stmt.on_conflict_do_update(index_elements=[PendingSignup.email], set_={"user_id": stmt.excluded.user_id}))
+    db.commit()
+
+def clear_pending_signup(email, db):
+    db.execute(delete(PendingSignup).where(PendingSignup.email == email.lower()))
+    db.commit()
+
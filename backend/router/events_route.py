@@ -0,0 +1,53 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from .user_route import verify_token
+from constants import settings
+from constants.logger import logger
+from services.notifications import broker, ensure_listener
+
+router = APIRouter()
+
+SETTINGS = settings.get_settings()
+
+def get_stream_token(request: Request, token: Optional[str] = Query(None, description="Access token; EventSource cannot send headers")):
+    """
+    Take the token from the Authorization header, or from the query string for
+    browser EventSource clients.
+    """
+    auth_header = request.headers.get("Authorization")
+    if auth_header:
+        return auth_header.split(" ")[1]
+    if token:
+        return token
+    raise HTTPException(status_code=401, detail="Authorization header missing")
+
+def stream_user(token: str = Depends(get_stream_token)):
+    return verify_token(token)
+
+async def session_event_stream(request: Request, user_id: str):
+    ensure_listener()
+    async with broker.subscribe(user_id) as queue:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                session_event = await asyncio.wait_for(queue.get(), timeout=SETTINGS.SESSION_EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {session_event['type']}\ndata: {json.dumps(session_event)}\n\n"
+
+# Server-Sent Events of the caller's session requests: new bookings for tutors,
+# status changes and cancellations for both sides. Replaces polling the listings.
+@router.get("/events/sessions")
+async def get_session_events(request: Request, user=Depends(stream_user)):
+    uid = user["user_id"]
+    logger.info(f"User {uid} subscribed to session events")
+    return StreamingResponse(
+        session_event_stream(request, uid),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,22 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from .user_route import require_role, verify_token
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import or_
-from database.config import get_db
-from models import SubjectDetail, Session, StatusDetail, UserDetail, TopicDetail, StudentDetail, TutorDetail
+from sqlalchemy import or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from database.config import get_db, get_engine, SessionLocal
+from models import SubjectDetail, Session, UserDetail, TopicDetail, StudentDetail, TutorDetail
+from models.session.session import PENDING_STATUS_ID
 from constants.logger import logger
-from pydantic import BaseModel
+from services.tutor_directory import refresh_tutor_directory
+from services.reference_data import get_status_id, is_status
+from services.notifications import publish_session_event
+from utils.pagination import encode_cursor, decode_cursor
+from utils.serialization import dumps, json_response, row_dicts, hhmm
+from pydantic import BaseModel, Field
 from datetime import date, time
-from typing import Optional
-from uuid import UUID
+from typing import List, Optional
+from enum import Enum
+import csv
+import io
+from uuid import UUID, uuid4
 
 router = APIRouter()
 
+# Every session column, as returned by the tutor request listing
+SESSION_COLUMNS = list(Session.__table__.c)
+SESSION_FIELDS = [column.key for column in SESSION_COLUMNS]
+
+# Columns of the partial unique index on pending session requests
+PENDING_REQUEST_KEY = [Session.tutor_id, Session.student_id, Session.topic_id, Session.date, Session.time]
+
 class SessionStatusUpdate(BaseModel):
     session_id:str
     status_id: int
     status: str
 
+class SessionBulkStatusUpdate(BaseModel):
+    session_ids: List[UUID] = Field(min_length=1, max_length=500)
+    status_id: int
+
 # Payload definition
 class SessionRequestPayload(BaseModel):
     date: date
@@ -34,21 +57,73 @@ class SessionRequestPayload(BaseModel):
     class Config:
         from_attributes = True
 
-
+class SessionBulkRequestPayload(BaseModel):
+    sessions: List[SessionRequestPayload] = Field(min_length=1, max_length=100)
+
+class SessionBulkItemResult(BaseModel):
+    index: int
+    status: str  # created, duplicate or forbidden
+    session_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+class SessionBulkResponse(BaseModel):
+    created: int
+    results: List[SessionBulkItemResult]
+
+def session_values(payload: SessionRequestPayload, status_id: int) -> dict:
+    """
+    Column values of a new session request; the id and the status are always set by
+    the server.
+    """
+    return {
+        "session_id": uuid4(),
+        "date": payload.date,
+        "time": payload.time,
+        "tutor_id": payload.tutor_id,
+        "student_id": payload.student_id,
+        "topic_id": payload.topic_id,
+        "status": status_id,
+        "time_started": payload.time_started,
+        "time_ended": payload.time_ended,
+        "duration": payload.duration,
+        "room_number": payload.room_number,
+        "modality": payload.modality
+    }
+
+def pending_request_key(payload: SessionRequestPayload) -> tuple:
+    # The time column has no zone, so "09:00:00Z" and "09:00:00" are the same slot
+    return (payload.tutor_id, payload.student_id, payload.topic_id, payload.date, payload.time.replace(tzinfo=None))
 
 # Tutor API to view session requests
 @router.get("/tutors/requests")
-def view_session_requests(user=Depends(require_role([1])), db: Session = Depends(get_db)):
+def view_session_requests(
+    limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    user=Depends(require_role([1])),
+    db: Session = Depends(get_db),
+):
     try:
         uid = user["user_id"]
-        pending_session_requests = []
 
-        session = db.query(Session).filter(UserDetail.userid == uid).all()    
-        for s in session:
-           if s.status == 0:
-               pending_session_requests.append(s) 
+        # Pending requests of this tutor only, served from the (tutor_id, status, date, time) index
+        query = select(*SESSION_COLUMNS).where(Session.tutor_id == uid, Session.status == 0)\
+            .order_by(Session.date, Session.time, Session.session_id)
+
+        if cursor:
+            last_date, last_time, last_session_id = decode_cursor(cursor, date, time, UUID)
+            query = query.where(tuple_(Session.date, Session.time, Session.session_id) > tuple_(last_date, last_time, last_session_id))
+
+        # Fetch one extra row to know whether another page exists
+        pending_session_requests = db.execute(query.limit(limit + 1)).all()
+        headers = {}
+        if len(pending_session_requests) > limit:
+            pending_session_requests = pending_session_requests[:limit]
+            last = pending_session_requests[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.date, last.time, last.session_id)
     
-        return pending_session_requests
+        return json_response(row_dicts(pending_session_requests, SESSION_FIELDS), headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving tutor requests: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during authentication")
@@ -69,11 +144,11 @@ def update_session_status( payload: SessionStatusUpdate, user=Depends(require_ro
             logger.info(f"User {uid} is not allowed to accept sessions.")
             raise HTTPException(status_code=403, detail="Permission denied.")
 
-        status_obj = db.query(StatusDetail).filter(StatusDetail.status_id == payload.status_id).first()
-        if not status_obj: 
+        if not is_status(db, payload.status_id): 
             raise HTTPException(status_code=403, detail=f"Status {payload.status} did not match the desired status value.")
         
-        session.status = status_obj.status_id 
+        session.status = payload.status_id
+        publish_session_event(db, "session.status_changed", session.session_id, session.tutor_id, session.student_id, payload.status_id)
         
         db.commit()
 
@@ -84,6 +159,40 @@ def update_session_status( payload: SessionStatusUpdate, user=Depends(require_ro
         logger.error(f"Error retrieving sessions: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during authentication")
 
+# Tutor API to accept or reject many session requests at once
+@router.post("/session/update-requests/bulk")
+def update_session_status_bulk(payload: SessionBulkStatusUpdate, user=Depends(require_role([1])), db: Session = Depends(get_db)):
+    uid = user["user_id"]
+
+    if not is_status(db, payload.status_id):
+        raise HTTPException(status_code=403, detail=f"Status {payload.status_id} did not match the desired status value.")
+
+    try:
+        # Ownership is part of the WHERE clause, so sessions of other tutors are never touched
+        updated_rows = db.execute(
+            update(Session)
+            .where(Session.session_id.in_(payload.session_ids), Session.tutor_id == uid)
+            .values(status=payload.status_id)
+            .returning(Session.session_id, Session.tutor_id, Session.student_id)
+        ).all()
+        for row in updated_rows:
+            publish_session_event(db, "session.status_changed", row.session_id, row.tutor_id, row.student_id, payload.status_id)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating sessions in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(f"Tutor {uid} set status {payload.status_id} on {len(updated_rows)} sessions")
+    updated_ids = {row.session_id for row in updated_rows}
+    return {
+        "updated": len(updated_ids),
+        "results": [
+            {"session_id": session_id, "status": "updated" if session_id in updated_ids else "not_found"}
+            for session_id in dict.fromkeys(payload.session_ids)
+        ]
+    }
+
 # Tutor views accepted student sessions
 @router.get("/sessions/accepted-requests")
 def get_student_accepted_requests(user=Depends(require_role([1])), db: Session = Depends(get_db)):
@@ -93,11 +202,11 @@ def get_student_accepted_requests(user=Depends(require_role([1])), db: Session =
         # Join necessary tables to fetch student name, subject, and topic
         sessions = (
             db.query(
-                UserDetail.name.label("student_name"),
+                UserDetail.name,
                 SubjectDetail.subject_name,
                 TopicDetail.topic_title,
                 Session.date,
-                Session.time,
+                hhmm(Session.time),
                 Session.session_id,
                 Session.status
             )
@@ -111,20 +220,7 @@ def get_student_accepted_requests(user=Depends(require_role([1])), db: Session =
         )
 
         logger.info("Fetching accepted sessions with student info for tutor")
-        return {
-            "session": [
-                {
-                    "name": s.student_name,
-                    "subject": s.subject_name,
-                    "topic": s.topic_title,
-                    "date": s.date.isoformat(),
-                    "time": s.time.strftime("%H:%M"),
-                    "session_id": s.session_id,
-                    "status": s.status
-                }
-                for s in sessions
-            ]
-        }
+        return json_response({"session": row_dicts(sessions, ["name", "subject", "topic", "date", "time", "session_id", "status"])})
 
     except Exception as e:
         logger.error(f"Error retrieving sessions: {e}")
@@ -138,11 +234,11 @@ def get_approved_requests(user=Depends(require_role([0])), db: Session = Depends
     try:
         sessions = (
             db.query(
-                UserDetail.name.label("tutor_name"),
+                UserDetail.name,
                 SubjectDetail.subject_name,
                 TopicDetail.topic_title,
                 Session.date,
-                Session.time,
+                hhmm(Session.time),
                 Session.session_id,
                 Session.status
             )
@@ -157,25 +253,26 @@ def get_approved_requests(user=Depends(require_role([0])), db: Session = Depends
         )
 
         logger.info("Fetching approved sessions of the student.")
-        return {
-            "session": [
-                {
-                    "name": s.tutor_name,
-                    "subject": s.subject_name,
-                    "topic": s.topic_title,
-                    "date": s.date.isoformat(),
-                    "time": s.time.strftime("%H:%M"),
-                    "session_id": s.session_id,
-                    "status_id": s.status
-                }
-                for s in sessions
-            ]
-        }
+        return json_response({"session": row_dicts(sessions, ["name", "subject", "topic", "date", "time", "session_id", "status_id"])})
 
     except Exception as e:
         logger.error(f"Error retrieving sessions: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during authentication")
 
+def get_pending_status_id(db: Session) -> int:
+    """
+    Status id of pending requests. uq_session_pending_request hard-codes it, so a
+    registry that disagrees would make every conflict-aware insert fail.
+    """
+    pending_status_id = get_status_id(db, "Pending")
+    if pending_status_id is None:
+        logger.error("Status 'pending' not found in status table")
+        raise HTTPException(status_code=500, detail="System configuration error: status 'pending' not found")
+    if pending_status_id != PENDING_STATUS_ID:
+        logger.error(f"Status 'pending' has id {pending_status_id}, but uq_session_pending_request expects {PENDING_STATUS_ID}")
+        raise HTTPException(status_code=500, detail="System configuration error: status 'pending' does not match the pending request index")
+    return pending_status_id
+
 # Student API to request sessions from tutor
 @router.post("/session/student/request", response_model=SessionRequestPayload)
 def request_session(payload: SessionRequestPayload, user=Depends(require_role([0])), db: Session = Depends(get_db)):
@@ -194,80 +291,101 @@ def request_session(payload: SessionRequestPayload, user=Depends(require_role([0
         logger.error("Student ID is required")
         raise HTTPException(status_code=400, detail="Student ID is required")
     
-    try:
-        status_query = db.query(StatusDetail).filter(StatusDetail.status == "Pending")
-        pending_status = status_query.first()
-        
-        if not pending_status:
-            logger.error("Status 'pending' not found in status table")
-            raise HTTPException(status_code=500, detail="System configuration error: status 'pending' not found")
+    pending_status_id = get_pending_status_id(db)
         
-        pending_status_id = pending_status.status_id
-        
-
-    except Exception as e:
-        logger.error(f"Error querying status table: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving status information")
+    logger.info(f"Requesting session with tutor {payload.tutor_id} for student {payload.student_id}")
     
     try:
-
-        existing_query = db.query(Session).filter(
-            Session.tutor_id == payload.tutor_id,
-            Session.topic_id == payload.topic_id,
-            Session.date == payload.date,
-            Session.time == payload.time,
-            Session.student_id == payload.student_id,
-            Session.status == pending_status_id
-
-        )
-        existing_session = existing_query.first()
-        
-
-        if existing_session:
+        # The partial unique index on pending slots turns a duplicate into a no-op,
+        # so the duplicate check and the insert are one atomic statement
+        created = db.execute(
+            insert(Session)
+            .values(session_values(payload, pending_status_id))
+            .on_conflict_do_nothing(index_elements=PENDING_REQUEST_KEY, index_where=Session.status == PENDING_STATUS_ID)
+            .returning(*Session.__table__.c)
+        ).mappings().first()
+
+        if created is None:
+            db.rollback()
             logger.warning(f"Duplicate session request detected for student {payload.student_id} with tutor {payload.tutor_id}")
             raise HTTPException(
-
                 status_code=409, 
                 detail="A session request with the same tutor, topic, date, and time is already pending. Please wait for a response or cancel the existing request."
-
             )
-            
 
-    except Exception as e:
-        logger.error(f"Error checking for existing sessions: {e}")
-        raise HTTPException(status_code=500, detail="Error checking for existing sessions")
-        
-    logger.info(f"Requesting session with tutor {payload.tutor_id} for student {payload.student_id}")
-    
-    try:
-        session = Session(
-            date=payload.date,
-            time=payload.time,
-            tutor_id=payload.tutor_id,
-            student_id=payload.student_id,
-            topic_id=payload.topic_id,
-            status=0,
-            time_started=payload.time_started,
-            time_ended=payload.time_ended,
-            duration=payload.duration,
-            room_number=payload.room_number,
-            modality=payload.modality
-        )
-        
-        # Add and commit to database
-        db.add(session)
+        publish_session_event(db, "session.requested", created["session_id"], created["tutor_id"], created["student_id"], pending_status_id)
         db.commit()
-        db.refresh(session)
         
         # Return the created session
-        return session
+        return dict(created)
 
-    
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating session: {e}")
         raise HTTPException(status_code=500, detail="Error creating session request")
 
+# Student API to request a series of sessions in one call
+@router.post("/session/student/request/bulk", response_model=SessionBulkResponse)
+def request_sessions_bulk(payload: SessionBulkRequestPayload, user=Depends(require_role([0])), db: Session = Depends(get_db)):
+    uid = str(user["user_id"])
+
+    pending_status_id = get_pending_status_id(db)
+
+    # Validate the whole batch up front: students may only book for themselves,
+    # and a slot repeated within the batch is only inserted once
+    results = [SessionBulkItemResult(index=i, status="duplicate") for i in range(len(payload.sessions))]
+    first_index = {}
+    for i, item in enumerate(payload.sessions):
+        if str(item.student_id) != uid:
+            results[i] = SessionBulkItemResult(index=i, status="forbidden", detail="Sessions can only be requested for yourself.")
+            continue
+        key = pending_request_key(item)
+        if key in first_index:
+            results[i].detail = f"Same slot as item {first_index[key]}."
+            continue
+        first_index[key] = i
+
+    logger.info(f"Student {uid} requesting {len(first_index)} sessions in bulk")
+
+    # Ids are generated here so returned rows map back to their batch item by id
+    values = [session_values(payload.sessions[i], pending_status_id) for i in first_index.values()]
+    index_by_id = {row["session_id"]: i for row, i in zip(values, first_index.values())}
+
+    try:
+        created = []
+        if values:
+            # One INSERT for the batch; slots that already have a pending request are skipped
+            created = db.execute(
+                insert(Session)
+                .values(values)
+                .on_conflict_do_nothing(index_elements=PENDING_REQUEST_KEY, index_where=Session.status == PENDING_STATUS_ID)
+                .returning(Session.session_id, *PENDING_REQUEST_KEY)
+            ).all()
+            for row in created:
+                publish_session_event(db, "session.requested", row.session_id, row.tutor_id, row.student_id, pending_status_id)
+            db.commit()
+
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Bulk session request references unknown rows: {e}")
+        raise HTTPException(status_code=400, detail="One or more sessions reference an unknown tutor or topic.")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error creating session requests: {e}")
+        raise HTTPException(status_code=500, detail="Error creating session requests")
+
+    for row in created:
+        i = index_by_id.pop(row.session_id)
+        results[i] = SessionBulkItemResult(index=i, status="created", session_id=row.session_id)
+
+    # Whatever was not returned collided with an existing pending request
+    for i in index_by_id.values():
+        results[i].detail = "A session request with the same tutor, topic, date, and time is already pending."
+
+    return {"created": len(created), "results": results}
+
 @router.delete("/session/delete/{session_id}")
 def delete_session_request(session_id: str, user=Depends(verify_token), db: Session = Depends(get_db)):
     uid = user["user_id"]
@@ -287,9 +405,11 @@ def delete_session_request(session_id: str, user=Depends(verify_token), db: Sess
             )
 
         topic_id = session.topic_id
+        tutor_id = session.tutor_id
 
         # Delete the session first
         db.delete(session)
+        publish_session_event(db, "session.deleted", session_id, tutor_id, uid)
         db.commit()
         logger.info(f"Session {session_id} deleted.")
 
@@ -300,6 +420,7 @@ def delete_session_request(session_id: str, user=Depends(verify_token), db: Sess
             topic = db.query(TopicDetail).filter(TopicDetail.topic_id == topic_id).first()
             if topic:
                 db.delete(topic)
+                refresh_tutor_directory(db, tutor_id)
                 db.commit()
                 logger.info(f"Topic {topic_id} deleted.")
         
@@ -312,50 +433,121 @@ def delete_session_request(session_id: str, user=Depends(verify_token), db: Sess
         logger.exception("Unexpected error during deletion:")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
-@router.get("/sessions/admin")
-def get_sessions(db: Session = Depends(get_db)):
+class SessionExportFormat(str, Enum):
+    JSON = "json"      # one page, with next_cursor
+    NDJSON = "ndjson"  # every matching session, one JSON object per line
+    CSV = "csv"        # every matching session as a CSV download
+
+ADMIN_SESSION_FIELDS = ["tutor_name", "student_name", "subject", "topic", "date", "time", "session_id", "status_id"]
+
+def admin_sessions_query(date_from: Optional[date], date_to: Optional[date]):
+    """
+    Accepted sessions with both participants' names, ordered for keyset paging.
+    Tutor and student names are joined straight from user_detail; the foreign keys
+    already guarantee the matching tutor_detail and student_detail rows.
+    """
     StudentUser = aliased(UserDetail)
     TutorUser = aliased(UserDetail)
-    try:
-        sessions = (
-            db.query(
-                StudentUser.name.label("student_name"),
-                TutorUser.name.label("tutor_name"),
-                SubjectDetail.subject_name,
-                TopicDetail.topic_title,
-                Session.date,
-                Session.time,
-                Session.session_id,
-                Session.status
-            )
-            .join(TutorDetail, TutorDetail.tutor_id == Session.tutor_id)
-            .join(StudentDetail, StudentDetail.student_id == Session.student_id)
-            .join(UserDetail, UserDetail.userid == TutorDetail.tutor_id)
-            .join(TopicDetail, TopicDetail.topic_id == Session.topic_id)
-            .join(SubjectDetail, SubjectDetail.subject_id == TopicDetail.subject_id)
-            .join(StudentUser, StudentUser.userid == StudentDetail.student_id)
-            .join(TutorUser, TutorUser.userid == TutorDetail.tutor_id)
-            .filter(Session.status == 1)
-            .all()
+    # Columns follow ADMIN_SESSION_FIELDS; the raw time is last and only used for cursors
+    query = (
+        select(
+            TutorUser.name,
+            StudentUser.name,
+            SubjectDetail.subject_name,
+            TopicDetail.topic_title,
+            Session.date,
+            hhmm(Session.time),
+            Session.session_id,
+            Session.status,
+            Session.time.label("sort_time")
         )
+        .join(StudentUser, StudentUser.userid == Session.student_id)
+        .join(TutorUser, TutorUser.userid == Session.tutor_id)
+        .join(TopicDetail, TopicDetail.topic_id == Session.topic_id)
+        .join(SubjectDetail, SubjectDetail.subject_id == TopicDetail.subject_id)
+        .where(Session.status == 1)
+        .order_by(Session.date, Session.time, Session.session_id)
+    )
+    if date_from:
+        query = query.where(Session.date >= date_from)
+    if date_to:
+        query = query.where(Session.date <= date_to)
+    return query
+
+def admin_session_row(s) -> dict:
+    return dict(zip(ADMIN_SESSION_FIELDS, s))
+
+def stream_admin_sessions(query, export_format: SessionExportFormat, batch_size: int = 1000):
+    """
+    Yield the export chunk by chunk from a server-side cursor. The generator owns
+    its database session because the request's session is closed before a
+    streaming body is sent.
+    """
+    db = SessionLocal(bind=get_engine())
+    try:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        if export_format == SessionExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=ADMIN_SESSION_FIELDS)
+            writer.writeheader()
+        for rows in result.partitions():
+            if export_format == SessionExportFormat.CSV:
+                writer.writerows(admin_session_row(s) for s in rows)
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                chunk = b"".join(dumps(admin_session_row(s)) + b"\n" for s in rows)
+            yield chunk
+        if export_format == SessionExportFormat.CSV and buffer.tell():
+            yield buffer.getvalue()
+    except Exception as e:
+        logger.error(f"Error streaming sessions: {e}")
+        raise
+    finally:
+        db.close()
+
+@router.get("/sessions/admin")
+def get_sessions(
+    date_from: Optional[date] = Query(None, description="Only sessions on or after this date"),
+    date_to: Optional[date] = Query(None, description="Only sessions on or before this date"),
+    limit: int = Query(100, ge=1, le=500, description="Items per page (json format only)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    format: SessionExportFormat = Query(SessionExportFormat.JSON, description="json page, or a full ndjson/csv export"),
+    user=Depends(require_role([2])),
+    db: Session = Depends(get_db),
+):
+    try:
+        query = admin_sessions_query(date_from, date_to)
+
+        if cursor:
+            last_date, last_time, last_session_id = decode_cursor(cursor, date, time, UUID)
+            query = query.where(tuple_(Session.date, Session.time, Session.session_id) > tuple_(last_date, last_time, last_session_id))
+
+        if format != SessionExportFormat.JSON:
+            logger.info(f"Exporting sessions as {format.value}....")
+            if format == SessionExportFormat.CSV:
+                return StreamingResponse(
+                    stream_admin_sessions(query, format),
+                    media_type="text/csv",
+                    headers={"Content-Disposition": 'attachment; filename="sessions.csv"'}
+                )
+            return StreamingResponse(stream_admin_sessions(query, format), media_type="application/x-ndjson")
+
+        # Fetch one extra row to know whether another page exists
+        sessions = db.execute(query.limit(limit + 1)).all()
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
 
         logger.info("Fetching all sessions....")
-        return {
-            "session": [
-                {
-                    "tutor_name": s.tutor_name,
-                    "student_name": s.student_name,
-                    "subject": s.subject_name,
-                    "topic": s.topic_title,
-                    "date": s.date.isoformat(),
-                    "time": s.time.strftime("%H:%M"),
-                    "session_id": s.session_id,
-                    "status_id": s.status
-                }
-                for s in sessions
-            ]
-        }
+        return json_response({
+            "session": row_dicts(sessions, ADMIN_SESSION_FIELDS),
+            "has_more": has_more,
+            "next_cursor": encode_cursor(sessions[-1].date, sessions[-1].sort_time, sessions[-1].session_id) if has_more else None
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving sessions: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during authentication")
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from .user_route import require_role
+from database.config import get_db
+from utils.cache import cache_stats
+from database.pool import pool_stats
+from services.reference_data import load_reference_data
+from services.notifications import broker
+
+router = APIRouter()
+
+# Admin view of in-process cache counters
+@router.get("/system/caches")
+def get_cache_stats(user=Depends(require_role([2]))):
+    return {"caches": cache_stats()}
+
+# Admin view of connection pool usage, checkout latency and exhaustion
+@router.get("/system/pool")
+def get_pool_stats(user=Depends(require_role([2]))):
+    return {"engines": pool_stats()}
+
+# Admin view of open session event streams in this worker
+@router.get("/system/events")
+def get_event_stats(user=Depends(require_role([2]))):
+    return {"subscribers": broker.stats()}
+
+# Reload status_detail and role_detail after editing them, instead of waiting for the TTL.
+# Only the process serving this request reloads; other workers follow within REFERENCE_DATA_TTL.
+@router.post("/system/reference-data/refresh")
+def refresh_reference_data(user=Depends(require_role([2])), db: Session = Depends(get_db)):
+    data = load_reference_data(db)
+    return {"statuses": data.statuses, "roles": data.roles}
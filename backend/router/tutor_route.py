@@ -1,19 +1,29 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session as DBSession
-from sqlalchemy import or_
-from database.config import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, tuple_, select, update
+from database.config import get_db, get_async_db
 from constants.logger import logger
-from pydantic import BaseModel
-from models import UserDetail, TutorAffiliation, TutorDetail, TutorAvailability, TutorExpertise, TutorSocials, SubjectDetail, StudentDetail, Session, TopicDetail
+from constants import settings
+from pydantic import BaseModel, Field
+from models import UserDetail, TutorDetail, TutorExpertise, SubjectDetail, StudentDetail, Session, TopicDetail, TutorDirectory, TutorDirectoryVersion
 from uuid import UUID
 from datetime import date, time
 from datetime import date
 from .user_route import require_role, verify_token
+from utils.pagination import encode_cursor, decode_cursor
+from utils.count_strategy import CountMode, resolve_total
+from utils.etag import make_etag, etag_matches, not_modified, validator_headers, conditional_response
+from utils.serialization import dumps, json_response, row_dicts, hhmm
+from services.tutor_directory import refresh_tutor_directory, directory_entry_to_card
+from services.tutor_cache import tutor_cache
+from services.reference_data import is_status
 
 router = APIRouter()
 
+SETTINGS = settings.get_settings()
+
 class TutorResponse(BaseModel):
     userid: UUID
     name: Optional[str] = None
@@ -36,96 +46,92 @@ class TutorResponse(BaseModel):
 
 class TutorsListResponse(BaseModel):
     tutors: List[TutorResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     limit: int
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 # Retrieve tutor list
 @router.get("/tutors", response_model=TutorsListResponse)
 async def get_tutors(
+    request: Request,
     name: Optional[str] = None,  # search by name
     expertise_filter: Optional[str] = None, # search by expertise
-    status: Optional[str] = None, # search by status
+    status: Optional[int] = None, # search by status
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: DBSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; takes precedence over page"),
+    count: CountMode = Query(CountMode.EXACT, description="How to compute total: exact (cached), estimated or none"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        # Build query with all joins at once
-        query = db.query(UserDetail)\
-            .join(TutorDetail, UserDetail.userid == TutorDetail.tutor_id)\
-            .outerjoin(TutorAffiliation, UserDetail.userid == TutorAffiliation.tutor_id)\
-            .outerjoin(TutorAvailability, UserDetail.userid == TutorAvailability.tutor_id)\
-            .outerjoin(TutorExpertise, UserDetail.userid == TutorExpertise.tutor_id)\
-            .outerjoin(TutorSocials, UserDetail.userid == TutorSocials.tutor_id)\
-            .outerjoin(SubjectDetail, UserDetail.userid == SubjectDetail.tutor_id)\
-            .options(
-                joinedload(UserDetail.tutor_detail),
-                joinedload(UserDetail.tutor_affiliation),
-                joinedload(UserDetail.tutor_availability),
-                joinedload(UserDetail.tutor_expertise),
-                joinedload(UserDetail.tutor_socials),
-                joinedload(UserDetail.subject_detail)
-            )
-        
+        # Every directory refresh bumps the version, so together with the request
+        # parameters it identifies the response without building it
+        version = await db.scalar(select(TutorDirectoryVersion.version).where(TutorDirectoryVersion.id == 1))
+        etag = make_etag(version or 0, name, expertise_filter, status, page, limit, cursor, count.value)
+        if etag_matches(request, etag):
+            return not_modified(etag, SETTINGS.CACHE_CONTROL_TUTOR_LIST)
+
+        # The directory read model holds one pre-aggregated row per tutor
+        query = select(TutorDirectory)
+
         # filters when searching for tutors pero optional pa muna 
         if name:
-            query = query.filter(UserDetail.name.ilike(f"%{name}%"))
+            query = query.where(TutorDirectory.name.ilike(f"%{name}%"))
         
-        if status:
-            query = query.filter(TutorDetail.status == status)
+        if status is not None:
+            query = query.where(TutorDirectory.status == status)
             
         if expertise_filter:
-            query = query.filter(TutorExpertise.expertise.contains([expertise_filter]))
-        
-        # Count total results before pagination
-        total_count = query.count()
+            query = query.where(TutorDirectory.expertise.contains([expertise_filter]))
+
+        # Count total results before pagination using the requested strategy
+        total_count = await resolve_total(
+            db,
+            query.with_only_columns(TutorDirectory.tutor_id),
+            count,
+            cache_key=("tutors", name, expertise_filter, status),
+            estimate_table="tutor_directory",
+            filtered=bool(name or expertise_filter or status is not None),
+        )
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        users = query.offset(offset).limit(limit).all()
+        # Stable ordering so that both offset and keyset pages are deterministic
+        query = query.order_by(TutorDirectory.datejoined, TutorDirectory.tutor_id)
+
+        # Apply pagination. Keyset mode seeks straight to the (datejoined, tutor_id)
+        # index position instead of scanning and discarding every earlier row.
+        if cursor:
+            last_datejoined, last_tutor_id = decode_cursor(cursor, date, UUID)
+            query = query.where(tuple_(TutorDirectory.datejoined, TutorDirectory.tutor_id) > tuple_(last_datejoined, last_tutor_id))
+        else:
+            query = query.offset((page - 1) * limit)
+
+        # Fetch one extra row to know whether another page exists
+        entries = (await db.scalars(query.limit(limit + 1))).all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].datejoined, entries[-1].tutor_id) if has_more else None
                 
-        # response data 
-        tutors_data = []
-        for user in users:
-            tutor_data = {
-                "userid": user.userid,
-                "name": user.name,
-                "email": user.email,
-                "datejoined": user.datejoined,
-                "subject": user.subject_detail.subject_name if hasattr(user, 'subject_detail') and user.subject_detail else None,
-                "description": user.tutor_detail.description if hasattr(user, 'tutor_detail') and user.tutor_detail else None,
-                "status": str(user.tutor_detail.status) if hasattr(user, 'tutor_detail') and user.tutor_detail else None,
-                "affiliations": [user.tutor_affiliation.affiliations] if hasattr(user, 'tutor_affiliation') and user.tutor_affiliation else None,
-                "availability": [user.tutor_availability.availability] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-                "available_time_from": [user.tutor_availability.available_time_from] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-                "available_time_to": [user.tutor_availability.available_time_to] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-                "expertise": [user.tutor_expertise.expertise] if hasattr(user, 'tutor_expertise') and user.tutor_expertise else None,
-                "socials": [user.tutor_socials.socials] if hasattr(user, 'tutor_socials') and user.tutor_socials else None
-            }
-            tutors_data.append(tutor_data)
-        
-        return {
-            "tutors": tutors_data,
+        # Directory rows are already in TutorResponse shape, so skip response_model validation
+        return json_response({
+            "tutors": [directory_entry_to_card(entry) for entry in entries],
             "total": total_count,
             "page": page,
-            "limit": limit
-        }
-        
+            "limit": limit,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }, headers=validator_headers(etag, SETTINGS.CACHE_CONTROL_TUTOR_LIST))
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching tutors: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching tutors: {str(e)}")
 
-        # Query for all subjects associated with this tutor
-        subjects_query = db.query(SubjectDetail)\
-            .filter(SubjectDetail.tutor_id == tutor_id)\
-            .all()
-        
-        subject_names = [subject.subject_name for subject in subjects_query] if subjects_query else []# View tutor details
-
 # View tutor details
 @router.get("/tutors/{tutor_id}", response_model=TutorResponse)
-async def get_tutor_by_id(tutor_id: str, db: DBSession = Depends(get_db)):
+async def get_tutor_by_id(tutor_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
 
         if tutor_id is None:
@@ -137,100 +143,24 @@ async def get_tutor_by_id(tutor_id: str, db: DBSession = Depends(get_db)):
         except ValueError:
             logger.error("Invalid UUID format")
             raise HTTPException(status_code=400, detail="Invalid UUID format")
-        
-
-        # Query the user/tutor
-        query = db.query(UserDetail)\
-            .join(TutorDetail, UserDetail.userid == TutorDetail.tutor_id)\
-            .outerjoin(TutorAffiliation, UserDetail.userid == TutorAffiliation.tutor_id)\
-            .outerjoin(TutorAvailability, UserDetail.userid == TutorAvailability.tutor_id)\
-            .outerjoin(TutorExpertise, UserDetail.userid == TutorExpertise.tutor_id)\
-            .outerjoin(TutorSocials, UserDetail.userid == TutorSocials.tutor_id)\
-            .options(
-
-                joinedload(UserDetail.tutor_detail),
-                joinedload(UserDetail.tutor_affiliation),
-                joinedload(UserDetail.tutor_availability),
-                joinedload(UserDetail.tutor_expertise),
-                joinedload(UserDetail.tutor_socials)
-            )
-        
-        # Filter by tutor_id
-
-        query = query.filter(UserDetail.userid == tutor_id)
-        user = query.first()
-        
-        if not user:
-            logger.error(f"Tutor with ID {tutor_id} not found")
-            raise HTTPException(status_code=404, detail="Tutor not found")
-        
-        # Query for all subjects associated with this tutor
-        subjects = db.query(SubjectDetail)\
-            .filter(SubjectDetail.tutor_id == tutor_id)\
-            .all()
-
-        
-        subject_names = [subject.subject_name for subject in subjects] if subjects else []
-        subject_ids = [subject.subject_id for subject in subjects] if subjects else []
-        
 
-       # Query for all topics related to the tutor's subjects
-        topics = []
-        if subject_ids:
-            # Debug output for subject IDs
-            logger.info(f"Querying topics for subject IDs: {subject_ids}")
-            print(f"Querying topics for subject IDs: {subject_ids}")
+        # Serve the already serialized profile and its ETag when we have them;
+        # a matching If-None-Match is then answered without touching the database
+        cached = tutor_cache.get(str(tutor_id))
+        if cached is None:
+            # Primary key lookup on the directory read model
+            entry = await db.get(TutorDirectory, tutor_id)
             
-            # Execute query with explicit column selection to ensure topic_title is retrieved
+            if not entry:
+                logger.error(f"Tutor with ID {tutor_id} not found")
+                raise HTTPException(status_code=404, detail="Tutor not found")
 
-            topics_query = db.query(TopicDetail.topic_id, TopicDetail.subject_id, TopicDetail.topic_title)\
-                .filter(TopicDetail.subject_id.in_(subject_ids))\
-                .all()
-            
-            # Debug output for found topics
-            logger.info(f"Found topics: {topics_query}")
-            print(f"Found topics: {topics_query}")
-            
-            # Extract topic titles, with checks to ensure topic_title exists
-            topic_titles = []
-            for topic in topics_query:
-                if hasattr(topic, 'topic_title') and topic.topic_title:
-                    print(f"Topic title found: {topic.topic_title}")
-                    topic_titles.append(topic.topic_title)
-                elif isinstance(topic, tuple) and len(topic) >= 3 and topic[2]:
-                    print(f"Topic title found in tuple: {topic[2]}")
-                    topic_titles.append(topic[2])
-            topic_id = []
-            for topic in topics_query:
-                if hasattr(topic, 'topic_id') and topic.topic_id:
-                    topic_id.append(topic.topic_id)
-                    print(f"Topic ID found: {topic.topic_id}")
-                elif isinstance(topic, tuple) and len(topic) >= 3 and topic[2]:
-                    topic_id.append(topic[2])
-                    print(f"Topic ID found in tuple: {topic[2]}")
-        else:
-            topic_titles = []
-            topic_id = []
-        
-        tutor_data = {
-            "userid": user.userid,
-            "name": user.name,
-            "email": user.email,
-            "datejoined": user.datejoined,
-            "subject": subject_names,
-            "topic_title": topic_titles,
-            "topic_id": topic_id,
-            "description": user.tutor_detail.description if hasattr(user, 'tutor_detail') and user.tutor_detail else None,
-            "status": str(user.tutor_detail.status) if hasattr(user, 'tutor_detail') and user.tutor_detail else None,
-            "affiliations": [user.tutor_affiliation.affiliations] if hasattr(user, 'tutor_affiliation') and user.tutor_affiliation else None,
-            "availability": [user.tutor_availability.availability] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-            "available_time_from": [user.tutor_availability.available_time_from] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-            "available_time_to": [user.tutor_availability.available_time_to] if hasattr(user, 'tutor_availability') and user.tutor_availability else None,
-            "expertise": [user.tutor_expertise.expertise] if hasattr(user, 'tutor_expertise') and user.tutor_expertise else None,
-            "socials": [user.tutor_socials.socials] if hasattr(user, 'tutor_socials') and user.tutor_socials else None
-        }
+            payload = dumps(directory_entry_to_card(entry))
+            cached = (make_etag(payload), payload)
+            tutor_cache.set(str(tutor_id), cached)
         
-        return tutor_data
+        etag, payload = cached
+        return conditional_response(request, payload, etag, SETTINGS.CACHE_CONTROL_TUTOR_DETAIL)
     except HTTPException:
         raise
     except Exception as e:
@@ -248,7 +178,7 @@ def get_students_for_tutor( user=Depends(require_role([1])), db: DBSession = Dep
             SubjectDetail.subject_name,
             TopicDetail.topic_title,
             Session.date,
-            Session.time,
+            hhmm(Session.time),
             Session.session_id
         )
         .join(StudentDetail, StudentDetail.student_id == Session.student_id)
@@ -260,29 +190,19 @@ def get_students_for_tutor( user=Depends(require_role([1])), db: DBSession = Dep
         .all()
     )
 
-    return [
-        {
-            "name": s.name,
-            "subject": s.subject_name,
-            "topic": s.topic_title,
-            "date": s.date.isoformat(),
-            "time": s.time.strftime("%H:%M"),
-            "session_id": s.session_id
-        }
-        for s in students
-    ]
+    return json_response(row_dicts(students, ["name", "subject", "topic", "date", "time", "session_id"]))
 
 @router.get("/tutor-requests")
 def get_tutor_requests(db: DBSession = Depends(get_db)):
     try:
         tutor_requests = (
             db.query(
-                UserDetail.name.label("tutor_name"),
+                UserDetail.name,
                 UserDetail.email,
-                TutorDetail.tutor_id,
-                TutorDetail.status.label("status_id"),
-                TutorExpertise.expertise, 
                 SubjectDetail.subject_name,
+                TutorDetail.status,
+                TutorExpertise.expertise, 
+                TutorDetail.tutor_id,
             )
             .join(TutorDetail, TutorDetail.tutor_id == UserDetail.userid)
             .join(TutorExpertise, TutorExpertise.tutor_id == TutorDetail.tutor_id)
@@ -291,19 +211,9 @@ def get_tutor_requests(db: DBSession = Depends(get_db)):
             .all()
         )
 
-        return {
-            "tutor_requests": [
-                {
-                    "tutor_name": r.tutor_name,
-                    "email": r.email,
-                    "subject": r.subject_name,
-                    "status_id": r.status_id,
-                    "expertise": r.expertise,
-                    "tutor_id": r.tutor_id
-                }
-                for r in tutor_requests
-            ]
-        }
+        return json_response({
+            "tutor_requests": row_dicts(tutor_requests, ["tutor_name", "email", "subject", "status_id", "expertise", "tutor_id"])
+        })
 
     except Exception as e:
         logger.error(f"Error retrieving tutor requests: {e}")
@@ -313,6 +223,10 @@ def get_tutor_requests(db: DBSession = Depends(get_db)):
 class StatusUpdate(BaseModel):
     status: int  # 1 for approve, 2 for reject
 
+class BulkStatusUpdate(BaseModel):
+    tutor_ids: List[UUID] = Field(min_length=1, max_length=1000)
+    status: int  # 1 for approve, 2 for reject
+
 @router.put("/tutor-requests/{tutor_id}/status")
 def update_tutor_status(tutor_id: str, update: StatusUpdate, db: DBSession = Depends(get_db)):
     tutor = db.query(TutorDetail).filter_by(tutor_id=tutor_id).first()
@@ -320,6 +234,38 @@ def update_tutor_status(tutor_id: str, update: StatusUpdate, db: DBSession = Dep
         raise HTTPException(status_code=404, detail="Tutor not found")
     
     tutor.status = update.status
+    refresh_tutor_directory(db, tutor.tutor_id)
     db.commit()
     logger.info(f"Tutor status updated to {tutor.status} for tutor_id={tutor.tutor_id}")
 
+# Admin API to approve or reject many tutor applications at once
+@router.put("/tutor-requests/status")
+def update_tutor_status_bulk(update_payload: BulkStatusUpdate, user=Depends(require_role([2])), db: DBSession = Depends(get_db)):
+    if not is_status(db, update_payload.status):
+        raise HTTPException(status_code=400, detail=f"Unknown status {update_payload.status}")
+
+    try:
+        updated = db.scalars(
+            update(TutorDetail)
+            .where(TutorDetail.tutor_id.in_(update_payload.tutor_ids))
+            .values(status=update_payload.status)
+            .returning(TutorDetail.tutor_id)
+        ).all()
+
+        # One directory refresh for the whole batch, committed with the update
+        refresh_tutor_directory(db, *updated)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating tutor statuses in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    logger.info(f"Tutor status updated to {update_payload.status} for {len(updated)} tutors")
+    updated_ids = set(updated)
+    return {
+        "updated": len(updated_ids),
+        "results": [
+            {"tutor_id": tutor_id, "status": "updated" if tutor_id in updated_ids else "not_found"}
+            for tutor_id in dict.fromkeys(update_payload.tutor_ids)
+        ]
+    }
@@ -1,11 +1,27 @@
-from fastapi import Depends, APIRouter, HTTPException, status, Request, File, UploadFile
+from fastapi import Depends, APIRouter, HTTPException, status, Request, File, UploadFile, Query
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from database.config import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_
+from database.config import get_db, get_async_db, get_engine, SessionLocal
 from models import UserDetail, StudentDetail, TutorDetail, TutorAffiliation, TutorAvailability, TutorExpertise, TutorSocials, AdminDetail, SubjectDetail
 from constants.supabase_client import supabase
 from jose import jwt, JWTError
 from constants import settings
 from constants.logger import logger
+from services.tutor_directory import refresh_tutor_directory
+from services.row_sync import SyncResult, sync_tutor_rows, update_if_changed
+from services.profile_loader import load_profile, evict_profile_on_commit
+from utils.cache import TTLCache
+from utils.pagination import encode_cursor, decode_cursor
+from utils.etag import make_etag, conditional_response
+from utils.serialization import dumps, json_response
+import hashlib
+import time
+from datetime import date, time as dt_time
+from typing import Optional
+from uuid import UUID
 
 router = APIRouter()
 
@@ -15,6 +31,25 @@ JWT_SECRET = SETTINGS.SUPABASE_JWT_SECRET
 JWT_ALGORITHM = "HS256"
 BUCKET_NAME = 'avatar'
 
+# Verified claims keyed by a hash of the token, kept until the token expires
+TOKEN_CACHE_ENABLED = SETTINGS.TOKEN_CACHE_ENABLED
+token_cache = TTLCache("verified_tokens", maxsize=SETTINGS.TOKEN_CACHE_MAXSIZE)
+
+# Role required to update each profile section, with the message logged on refusal
+SECTION_PERMISSIONS = {
+    "student": ("0", "Only students can update student fields."),
+    "tutor": ("1", "Only tutors can update tutor fields."),
+    "admin": ("2", "Only an admin can update admin fields."),
+    "subject": ("1", "Only tutors can update subjects."),
+    "expertise": ("1", "Only tutors can update expertise."),
+    "availability": ("1", "Only tutors can update tutor availability."),
+    "affiliation": ("1", "Only tutors can update tutor affiliation."),
+    "socials": ("1", "Only tutors can update tutor socials."),
+}
+
+# Profile sections that are mirrored in the tutor directory
+DIRECTORY_SECTIONS = {"user", "tutor", "subject", "expertise", "availability", "affiliation", "socials"}
+
 def require_role(allowed_roles: list[int]):
     """
     Ensures role based access to routes.
@@ -44,7 +79,14 @@ def get_authorization_token(request: Request):
 def verify_token(token: str = Depends(get_authorization_token)): 
     """
     Verify JWT token and extract user information.
+    A token that verified once is served from the cache until its `exp`.
     """
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    if TOKEN_CACHE_ENABLED:
+        claims = token_cache.get(token_key)
+        if claims is not None:
+            return dict(claims)
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], audience="authenticated")
         user_id = payload.get("sub")
@@ -54,10 +96,16 @@ def verify_token(token: str = Depends(get_authorization_token)):
             logger.error("Token is missing user subject.")
             raise HTTPException(status_code=401, detail="Invalid token: Missing required fields.")
 
-        return {
+        claims = {
             "user_id": user_id,
             "role": role
         }
+
+        # Only tokens with an expiry are cached, and never past it
+        if TOKEN_CACHE_ENABLED and "exp" in payload:
+            token_cache.set(token_key, claims, ttl=payload["exp"] - time.time())
+
+        return dict(claims)
     
     except HTTPException:
         raise
@@ -66,85 +114,96 @@ def verify_token(token: str = Depends(get_authorization_token)):
         logger.error(f"Token verification failed: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Invalid or expired token: {str(e)}")
 
+def user_row(user) -> dict:
+    return {
+        "user_id": user.userid,
+        "name": user.name,
+        "email": user.email,
+        "date_joined": user.datejoined
+    }
+
+def stream_users(query, batch_size: int = 1000):
+    """
+    Yield the {"users": [...]} document incrementally from a server-side cursor.
+    The generator owns its database session because the request's session is
+    closed before a streaming body is sent.
+    """
+    db = SessionLocal(bind=get_engine())
+    try:
+        yield b'{"users":['
+        separator = b""
+        for rows in db.execute(query.execution_options(yield_per=batch_size)).partitions():
+            yield separator + b",".join(dumps(user_row(user)) for user in rows)
+            separator = b","
+        yield b"]}"
+    except Exception as e:
+        logger.error(f"Error streaming users: {e}")
+        raise
+    finally:
+        db.close()
+
 @router.get("/")
-def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(
+    limit: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    stream: bool = Query(False, description="Stream every user as one JSON document instead of a page"),
+    user=Depends(require_role([2])),
+    db: Session = Depends(get_db),
+):
     try:
-        users = db.query(UserDetail).all()
+        # Only the four exposed columns, as plain rows, in (datejoined, userid) index order
+        query = select(UserDetail.userid, UserDetail.name, UserDetail.email, UserDetail.datejoined)\
+            .order_by(UserDetail.datejoined, UserDetail.userid)
+
+        if cursor:
+            last_datejoined, last_userid = decode_cursor(cursor, date, UUID)
+            query = query.where(tuple_(UserDetail.datejoined, UserDetail.userid) > tuple_(last_datejoined, last_userid))
+
+        if stream:
+            logger.info("Streaming all users from Supabase")
+            return StreamingResponse(stream_users(query), media_type="application/json")
+
+        # Fetch one extra row to know whether another page exists
+        users = db.execute(query.limit(limit + 1)).all()
+        has_more = len(users) > limit
+        users = users[:limit]
+
         logger.info("Fetching all users from Supabase")
-        return {"users": [ 
-            {
-                "user_id": user.userid,
-                "name": user.name,
-                "email": user.email,
-                "date_joined": str(user.datejoined)
-            } 
-            for user in users 
-        ]}
+        return json_response({
+            "users": [user_row(user) for user in users],
+            "has_more": has_more,
+            "next_cursor": encode_cursor(users[-1].datejoined, users[-1].userid) if has_more else None
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving users: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during authentication")
 
 @router.get("/users/profile")
-def get_profile(user= Depends(verify_token), db: Session = Depends(get_db)):
+def get_profile(request: Request, user= Depends(verify_token), db: Session = Depends(get_db)):
     try:
         uid = user["user_id"] 
         roles = user["role"]
         
         logger.info(f"Profile preview made by user {uid}")
 
-        # Fetch user from supabase
-        user_detail = db.query(UserDetail).filter(UserDetail.userid == uid).first()
-
-        # Fetch roles from Supabase
         role_ids = [int(r) for r in roles]
         logger.info(f"Role ids: {role_ids}")
-        response = {
-            "user": {
-                "name": user_detail.name,
-                "email": user_detail.email,
-                "datejoined": str(user_detail.datejoined),
-                "image_public_url": user_detail.image_public_url
-            }
-        }
-
-        logger.info(f"Details: {response}")
-        # Add student data if applicable
-        if 0 in role_ids:
-            student = db.query(StudentDetail).filter(StudentDetail.student_id == uid).first()
-            if student:
-                response["student"] = {
-                    "student_number": student.student_number,
-                    "degree_program": student.degree_program
-                }
-
-        # Add tutor data if applicable
-        if 1 in role_ids:
-            tutor = db.query(TutorDetail).filter(TutorDetail.tutor_id == uid).first()
-            availability = db.query(TutorAvailability).filter(TutorAvailability.tutor_id == uid).all()
-            affiliation = db.query(TutorAffiliation).filter(TutorAffiliation.tutor_id == uid).all()
-            expertise = db.query(TutorExpertise).filter(TutorExpertise.tutor_id == uid).all()
-            socials = db.query(TutorSocials).filter(TutorSocials.tutor_id == uid).all()
-            subject = db.query(SubjectDetail).filter(SubjectDetail.tutor_id == uid).all()
-            if tutor:
-                response["tutor"] = {
-                    "description": tutor.description,
-                    "status": tutor.status,
-                    "affiliations": [a.affiliations for a in affiliation],
-                    "expertise": [e.expertise for e in expertise],
-                    "socials": [s.socials for s in socials],
-                    "availability": [a.availability for a in availability],
-                    "subject": [s.subject_name for s in subject]
-                }
 
-        if 2 in role_ids:
-            admin = db.query(AdminDetail).filter(AdminDetail.admin_id == uid).first()
+        # User plus every role section in a single statement (or from the cache)
+        response = load_profile(db, uid, role_ids)
+        if response is None:
+            logger.error("User requested is not found.")
+            raise HTTPException(status_code=404, detail="User not found.")
 
-            if admin:
-                response["admin"] = {
-                    "admin_role": admin.admin_role
-                }
+        # Hashing the body is cheap next to the query a cache miss already paid for,
+        # and a cache hit answers a repeat visit with 304 without querying at all
+        content = dumps(response, sort_keys=True)
+        return conditional_response(request, content, make_etag(content), SETTINGS.CACHE_CONTROL_PROFILE)
 
-        return response
+    except HTTPException:
+        raise
     
     except Exception:
         logger.error("User requested is not found.")
@@ -154,6 +213,7 @@ def get_profile(user= Depends(verify_token), db: Session = Depends(get_db)):
 def update_user_profile(
     data: dict, 
     user=Depends(verify_token), 
+    db: Session = Depends(get_db),
     ):
 
     uid = user["user_id"]
@@ -164,6 +224,16 @@ def update_user_profile(
         if not user:
             logger.error("User not found in database.")
             raise HTTPException(status_code=404, detail="User not found.")
+
+        # Check every requested section up front so a rejected patch writes nothing
+        for section, (required_role, message) in SECTION_PERMISSIONS.items():
+            if section in data and required_role not in role:
+                logger.error(message)
+                raise HTTPException(status_code=403, detail="Permission denied.")
+
+        # All sections are applied in one transaction below and committed together.
+        # Only rows that actually change are written.
+        result = SyncResult()
         
         # User table
         if "user" in data:
@@ -173,144 +243,110 @@ def update_user_profile(
             }
             user_fields = {k: v for k, v in user_fields.items() if v is not None}
             if user_fields:
-                supabase.table("user_detail").update(user_fields).eq("userid", uid).execute()
+                result += update_if_changed(db, UserDetail, UserDetail.userid, uid, user_fields)
 
         # Student table
         if "student" in data:
             logger.info("Updating student info...")
-            if "0" in role:
-                student_fields = {
-                    "student_number": data["student"].get("student_number"),
-                    "degree_program": data["student"].get("degree_program")
-                }
-                student_fields = {k: v for k, v in student_fields.items() if v is not None}
-                if student_fields:
-                    supabase.table("student_detail").update(student_fields).eq("student_id", uid).execute()
-            else:
-                logger.error("Only students can update student fields.")
-                raise HTTPException(status_code=403, detail="Permission denied.")
+            student_fields = {
+                "student_number": data["student"].get("student_number"),
+                "degree_program": data["student"].get("degree_program")
+            }
+            student_fields = {k: v for k, v in student_fields.items() if v is not None}
+            if student_fields:
+                result += update_if_changed(db, StudentDetail, StudentDetail.student_id, uid, student_fields)
 
         # Tutor table
         if "tutor" in data:
-            if "1" in role:
-                tutor_fields = {
-                    "description": data["tutor"].get("description")
-                }
-                tutor_fields = {k: v for k, v in tutor_fields.items() if v is not None}
-                
-                if tutor_fields:
-                    supabase.table("tutor_detail").update(tutor_fields).eq("tutor_id", uid).execute()
-            else:
-                logger.error("Only tutors can update tutor fields.")
-                raise HTTPException(status_code=403, detail="Permission denied")
+            tutor_fields = {
+                "description": data["tutor"].get("description")
+            }
+            tutor_fields = {k: v for k, v in tutor_fields.items() if v is not None}
+            
+            if tutor_fields:
+                result += update_if_changed(db, TutorDetail, TutorDetail.tutor_id, uid, tutor_fields)
 
         # Admin table
         if "admin" in data:
-            if "2" in role:
-                admin_fields = {
-                    "admin_role": data["admin"].get("admin_role")
-                }
-                
-                if admin_fields:
-                    supabase.table("admin_detail").update(admin_fields).eq("admin_id", uid).execute()
-            else:
-                logger.error("Only an admin can update admin fields.")
-                raise HTTPException(status_code=403, detail="Permission denied")
+            admin_fields = {
+                "admin_role": data["admin"].get("admin_role")
+            }
+            admin_fields = {k: v for k, v in admin_fields.items() if v is not None}
+            
+            if admin_fields:
+                result += update_if_changed(db, AdminDetail, AdminDetail.admin_id, uid, admin_fields)
         
         if "subject" in data:
-            if "1" in role:
-                subject_name = data["subject"].get("subject_name", [])
-                supabase.table("subject_detail").delete().eq("tutor_id", uid).execute()
-                for name in subject_name:
-                    supabase.table("subject_detail").insert({
-                        "tutor_id": uid,
-                        "subject_name": name
-                    }).execute()
-            else:
-                logger.error("Only tutors can update subjects.")
-                raise HTTPException(status_code=403, detail="Permission denied")
+            subject_name = data["subject"].get("subject_name", [])
+            result += sync_tutor_rows(db, SubjectDetail, uid, [{"subject_name": name} for name in subject_name], ("subject_name",))
         
         if "expertise" in data:
-            if "1" in role:
-                expertise_list = data["expertise"].get("expertise", [])
-                supabase.table("tutor_expertise").delete().eq("tutor_id", uid).execute()
-                for topic in expertise_list:
-                    supabase.table("tutor_expertise").insert({
-                        "tutor_id": uid,
-                        "expertise": topic
-                    }).execute()
-            else:
-                logger.error("Only tutors can update expertise.")
-                raise HTTPException(status_code=403, detail="Permission denied") 
+            expertise_list = data["expertise"].get("expertise", [])
+            result += sync_tutor_rows(db, TutorExpertise, uid, [{"expertise": topic} for topic in expertise_list], ("expertise",))
 
         if "availability" in data:
-            if "1" in role:
-                availability_list = data["availability"]
-                dates = availability_list.get("availability", [])
-                time_from = availability_list.get("available_time_from", [])
-                time_to = availability_list.get("available_time_to", [])
-
-                # Delete existing availability entries
-                supabase.table("tutor_availability").delete().eq("tutor_id", uid).execute()
-
-                # Insert new availability entries
-                for i in range(len(dates)):
-                    if i < len(time_from) and i < len(time_to):
-                        supabase.table("tutor_availability").insert({
-                            "tutor_id": uid,
-                            "availability": dates[i],
-                            "available_time_from": time_from[i],
-                            "available_time_to": time_to[i]
-                        }).execute()
-            else:
-                logger.error("Only tutors can update tutor availability.")
-                raise HTTPException(status_code=403, detail="Permission denied")    
-
+            availability_list = data["availability"]
+            dates = availability_list.get("availability", [])
+            time_from = availability_list.get("available_time_from", [])
+            time_to = availability_list.get("available_time_to", [])
+
+            # Slots without both times are skipped
+            result += sync_tutor_rows(db, TutorAvailability, uid, [
+                {
+                    "availability": parse_date(day),
+                    "available_time_from": parse_time(start),
+                    "available_time_to": parse_time(end)
+                }
+                for day, start, end in zip(dates, time_from, time_to)
+            ], ("availability", "available_time_from", "available_time_to"))
 
         if "affiliation" in data:
-            if "1" in role:
-                affiliation_list = data["affiliation"].get("affiliation", [])
-                supabase.table("tutor_affiliation").delete().eq("tutor_id", uid).execute()
-                for affiliation in affiliation_list:
-                    supabase.table("tutor_affiliation").insert({
-                        "tutor_id": uid,
-                        "affiliations": affiliation
-                    }).execute()
-            else:
-                logger.error("Only tutors can update tutor affiliation.")
-                raise HTTPException(status_code=403, detail="Permission denied")    
+            affiliation_list = data["affiliation"].get("affiliation", [])
+            result += sync_tutor_rows(db, TutorAffiliation, uid, [{"affiliations": affiliation} for affiliation in affiliation_list], ("affiliations",))
 
         if "socials" in data:
-            if "1" in role:
-                # Get socials from the metadata 
-                socials_list = data["socials"].get("socials", [])
-                
-                # Get socials from the database, if it exists
-                supabase.table("tutor_socials").delete().eq("tutor_id", uid).execute()
-                for link in socials_list:
-                    supabase.table("tutor_socials").insert({
-                        "tutor_id": uid,
-                        "socials": link
-                    }).execute()
-            else:
-                logger.error("Only tutors can update tutor socials.")
-                raise HTTPException(status_code=403, detail="Permission denied")        
+            # Get socials from the metadata 
+            socials_list = data["socials"].get("socials", [])
+            result += sync_tutor_rows(db, TutorSocials, uid, [{"socials": link} for link in socials_list], ("socials",))
+
+        # Keep the tutor directory read model in step with the tutor's data
+        if result.touched and "1" in role and DIRECTORY_SECTIONS.intersection(data):
+            refresh_tutor_directory(db, uid)
+
+        if result.touched:
+            evict_profile_on_commit(db, uid)
 
-        return {"message": "Profile updated successfully."}
+        db.commit()
+        logger.info(f"Profile of {uid} saved: {result.inserted} inserted, {result.deleted} deleted, {result.updated} updated")
+
+        return {"message": "Profile updated successfully.", "rows_touched": result.touched}
     
     except HTTPException:
+        db.rollback()
         raise
 
     except Exception as e:
+        db.rollback()
         logger.error(f"User detail cannot be updated. Error: {str(e)}")
         raise HTTPException(status_code=400, detail="Update user failed.")
+
+def parse_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+def parse_time(value) -> dt_time:
+    """
+    Parse an ISO time such as "09:00:00.000Z". Times are stored without a zone,
+    so the offset is dropped the same way Postgres does when casting.
+    """
+    parsed = value if isinstance(value, dt_time) else dt_time.fromisoformat(str(value))
+    return parsed.replace(tzinfo=None)
     
 @router.post("/profile/upload-image")
 @router.put("/profile/upload-image")
 async def upload_image(
     request: Request,
     user_id: str,
-    file: UploadFile = File(...), db: Session = Depends(get_db)
+    file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)
 ):
     if request.method == "POST":
         print("Creating new profile image")
@@ -340,8 +376,10 @@ async def upload_image(
             raise HTTPException(status_code=400,detail="File is empty or corrupted.")
         
         # Delete existing files first (handle errors gracefully)
+        # The Supabase client is synchronous, so storage calls run in the threadpool
+        bucket = supabase.storage.from_(BUCKET_NAME)
         try:
-            remove_response = supabase.storage.from_(BUCKET_NAME).remove([
+            remove_response = await run_in_threadpool(bucket.remove, [
                 f"{user_id}.png",
                 f"{user_id}.jpeg",
                 f"{user_id}.jpg"
@@ -359,24 +397,26 @@ async def upload_image(
 
 
         # Upload and overwrite if exists
-        response = supabase.storage.from_(BUCKET_NAME).upload(
+        response = await run_in_threadpool(
+            bucket.upload,
             filename,
             file_bytes,
             {"content-type": file.content_type},
         )
 
-        public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(filename)
+        public_url = bucket.get_public_url(filename)
         logger.info(f"PUBLIC URL: {public_url}")
         if response: 
             logger.info(f"File {filename} uploaded by user {user_id}, URL: {public_url}")
          
         # Update DB
-        user_detail = db.query(UserDetail).filter(UserDetail.userid == user_id).first()
+        user_detail = await db.scalar(select(UserDetail).where(UserDetail.userid == user_id))
         if not user_detail:
             raise HTTPException(status_code=404, detail="User not found.")
 
         user_detail.image_public_url = public_url
-        db.commit()
+        evict_profile_on_commit(db, user_id)
+        await db.commit()
 
         return {"image_public_url": public_url}
 
@@ -0,0 +1,47 @@
+# Description: One-off backfill of pending_signup for auth users that signed up before
+# the table existed and have not been verified into user_detail yet. Pages through the
+# Supabase admin user list once; the API itself never lists users.
+#
+#   python -m scripts.backfill_pending_signups
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from constants.supabase_client import supabase_admin
+from database.config import SessionLocal, get_engine
+from models import PendingSignup, UserDetail
+
+PER_PAGE = 1000
+
+def main():
+    db = SessionLocal(bind=get_engine())
+    try:
+        known_ids = {str(user_id) for user_id in db.scalars(select(UserDetail.userid))}
+        added = 0
+        page = 1
+        while True:
+            users = supabase_admin.auth.admin.list_users(page=page, per_page=PER_PAGE)
+            if not users:
+                break
+
+            rows = [
+                {"email": u.email.lower(), "user_id": u.id}
+                for u in users
+                if u.email and str(u.id) not in known_ids
+            ]
+            if rows:
+                db.execute(insert(PendingSignup).values(rows).on_conflict_do_nothing())
+                added += len(rows)
+
+            if len(users) < PER_PAGE:
+                break
+            page += 1
+
+        db.commit()
+        print(f"pending_signup backfilled with {added} users")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Description: Compares peak Python memory and wall time of GET / (all users) built the
+# old way (every UserDetail entity loaded with .all()) against a single page and against
+# the streamed export. Seeds --users rows into user_detail, commits them so the streaming
+# generator's own session can see them, and deletes them again afterwards.
+#
+#   python -m scripts.bench_all_users_memory --users 100000
+import argparse
+import time
+import tracemalloc
+import orjson
+from sqlalchemy import delete, select, text
+from database.config import SessionLocal, get_engine
+from models import UserDetail
+from router.user_route import get_all_users, stream_users, user_row
+
+BENCH_DOMAIN = "@bench-users.local"
+
+def measure(label, call):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = call()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed * 1000:>9.0f}ms {peak / 1024 / 1024:>9.1f}MB {size:>12}")
+
+def load_all_entities(db):
+    # What the endpoint did before: full ORM entities, then a list of dicts
+    users = db.query(UserDetail).all()
+    payload = {"users": [user_row(user) for user in users]}
+    db.expunge_all()
+    return len(payload["users"])
+
+def one_page(db):
+    response = get_all_users(limit=100, cursor=None, stream=False, user={"role": ["2"]}, db=db)
+    return len(orjson.loads(response.body)["users"])
+
+def stream_all():
+    # The same query the endpoint hands to its streaming generator
+    query = select(UserDetail.userid, UserDetail.name, UserDetail.email, UserDetail.datejoined)\
+        .order_by(UserDetail.datejoined, UserDetail.userid)
+    return sum(len(chunk) for chunk in stream_users(query))
+
+def main():
+    parser = argparse.ArgumentParser(description="GET / memory benchmark")
+    parser.add_argument("--users", type=int, default=100000)
+    args = parser.parse_args()
+
+    db = SessionLocal(bind=get_engine())
+    try:
+        db.execute(text(
+            "INSERT INTO user_detail (userid, name, email, datejoined) "
+            "SELECT gen_random_uuid(), 'Bench user ' || g, 'user' || g || :domain, current_date - g % 2000 "
+            "FROM generate_series(1, :users) g"
+        ), {"users": args.users, "domain": BENCH_DOMAIN})
+        db.commit()
+
+        print(f"{'variant':<22} {'time':>11} {'peak':>11} {'rows/bytes':>12}")
+        measure("ORM .all() (before)", lambda: load_all_entities(db))
+        measure("page of 100", lambda: one_page(db))
+        measure("streamed export", stream_all)
+    finally:
+        db.rollback()
+        db.execute(delete(UserDetail).where(UserDetail.email.like(f"%{BENCH_DOMAIN}")))
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Description: Reports how long `import main` takes in a fresh interpreter, broken
+# down per module using `python -X importtime`. Run from the backend directory with
+# the usual environment variables set:
+#
+#   python -m scripts.bench_cold_start --runs 5 --top 25
+#   python -m scripts.bench_cold_start --budget-ms 800   # exits 1 when over budget
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def import_times(module: str) -> list[tuple[str, int, int, int]]:
+    """
+    Import `module` in a fresh interpreter and return (name, self_us, cumulative_us, depth)
+    for every module it pulled in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {module} failed")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start import time report")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to sample; the median run is reported")
+    parser.add_argument("--top", type=int, default=20, help="number of slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, help="fail when the total import time exceeds this")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [next(cumulative for name, _, cumulative, _ in rows if name == args.module) for rows in runs]
+    median_total = statistics.median(totals)
+    rows = runs[totals.index(min(totals, key=lambda t: abs(t - median_total)))]
+
+    print(f"import {args.module}: median {median_total / 1000:.1f} ms over {args.runs} runs "
+          f"(min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms)")
+
+    print(f"\nTop {args.top} top-level packages by cumulative time:")
+    top_level = {}
+    for name, _, cumulative, _ in rows:
+        if "." not in name:
+            top_level[name] = max(top_level.get(name, 0), cumulative)
+    for package, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {package}")
+
+    print(f"\nTop {args.top} modules by self time:")
+    for name, self_us, _, _ in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and median_total / 1000 > args.budget_ms:
+        print(f"\nFAIL: import time {median_total / 1000:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Description: Measures throughput and latency of an endpoint under concurrent load.
+# Run it against a server built from the commit before the async database layer and
+# against the current one to compare, e.g.
+#
+#   uvicorn main:app --workers 1 &
+#   python -m scripts.bench_concurrency http://127.0.0.1:8000/tutors --concurrency 50 --requests 2000
+#
+# With the sync session inside `async def` handlers every query blocks the event loop,
+# so throughput stays flat as concurrency grows; with the async session it scales
+# until the connection pool is saturated.
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+async def worker(client, url, headers, queue, latencies, errors):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        started = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - started)
+
+async def run(url, concurrency, total, token):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        # Warm up the connection pool and any caches before measuring
+        await client.get(url, headers=headers)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, url, headers, queue, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"url:          {url}")
+    print(f"concurrency:  {concurrency}")
+    print(f"requests:     {len(latencies)} ({len(errors)} errors)")
+    print(f"throughput:   {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency mean: {statistics.mean(latencies) * 1000:.1f} ms")
+    print(f"latency p50:  {pct(0.50):.1f} ms")
+    print(f"latency p95:  {pct(0.95):.1f} ms")
+    print(f"latency p99:  {pct(0.99):.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent GET load test")
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.requests, args.token))
+
+if __name__ == "__main__":
+    main()
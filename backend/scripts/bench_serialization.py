@@ -0,0 +1,109 @@
+# Description: Compares the old and the new way list endpoints turn rows into response
+# bytes, without a database. The old path builds dicts by hand (isoformat/strftime per
+# row) and lets FastAPI validate them against the response_model and encode them with
+# json; the new path zips SQL-shaped row tuples into dicts and encodes them with orjson.
+#
+#   python -m scripts.bench_serialization --sessions 1000 --tutors 100
+import argparse
+import json
+import timeit
+import uuid
+from datetime import date, time, timedelta
+from fastapi.encoders import jsonable_encoder
+from router.tutor_route import TutorsListResponse
+from services.tutor_directory import directory_entry_to_card
+from types import SimpleNamespace
+from utils.serialization import dumps, row_dicts
+
+SESSION_FIELDS = ["name", "subject", "topic", "date", "time", "session_id", "status"]
+
+def fastapi_json(content) -> bytes:
+    # What JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+def session_rows(count):
+    today = date.today()
+    raw = [
+        SimpleNamespace(
+            student_name=f"Student {i}", subject_name=f"Subject {i % 20}", topic_title=f"Topic {i % 50}",
+            date=today + timedelta(days=i % 90), time=time(8 + i % 10, 30), session_id=uuid.uuid4(), status=1,
+        )
+        for i in range(count)
+    ]
+    # Rows as the SQL query now returns them, with the time already formatted
+    shaped = [(s.student_name, s.subject_name, s.topic_title, s.date, s.time.strftime("%H:%M"), s.session_id, s.status) for s in raw]
+    return raw, shaped
+
+def sessions_before(raw):
+    return fastapi_json(jsonable_encoder({
+        "session": [
+            {
+                "name": s.student_name,
+                "subject": s.subject_name,
+                "topic": s.topic_title,
+                "date": s.date.isoformat(),
+                "time": s.time.strftime("%H:%M"),
+                "session_id": s.session_id,
+                "status": s.status
+            }
+            for s in raw
+        ]
+    }))
+
+def sessions_after(shaped):
+    return dumps({"session": row_dicts(shaped, SESSION_FIELDS)})
+
+def tutor_entries(count):
+    today = date.today()
+    return [
+        SimpleNamespace(
+            tutor_id=uuid.uuid4(), name=f"Tutor {i}", email=f"tutor{i}@example.com", datejoined=today - timedelta(days=i),
+            description="Tutor description " * 5, status=1,
+            subject=[f"Subject {k}" for k in range(3)], topic_title=[f"Topic {k}" for k in range(6)],
+            topic_id=[uuid.uuid4() for _ in range(6)], affiliations=["Org A", "Org B"],
+            availability=[today + timedelta(days=k) for k in range(5)],
+            available_time_from=[time(9)] * 5, available_time_to=[time(17)] * 5,
+            expertise=["Math", "Physics", "Chemistry"], socials=["https://example.com/a", "https://example.com/b"],
+        )
+        for i in range(count)
+    ]
+
+def tutor_page(entries):
+    return {
+        "tutors": [directory_entry_to_card(entry) for entry in entries],
+        "total": len(entries), "page": 1, "limit": len(entries), "has_more": False, "next_cursor": None,
+    }
+
+def tutors_before(entries):
+    # response_model validation, serialization to JSON-compatible python, then json
+    model = TutorsListResponse.model_validate(tutor_page(entries))
+    return fastapi_json(model.model_dump(mode="json"))
+
+def tutors_after(entries):
+    return dumps(tutor_page(entries))
+
+def report(label, before, after, number):
+    before_time = min(timeit.repeat(before, number=number, repeat=5)) / number
+    after_time = min(timeit.repeat(after, number=number, repeat=5)) / number
+    print(f"{label:<22} {before_time * 1000:>9.2f}ms {after_time * 1000:>9.2f}ms {before_time / after_time:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="List endpoint serialization benchmark")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--tutors", type=int, default=100)
+    parser.add_argument("--number", type=int, default=50, help="calls per timing run")
+    args = parser.parse_args()
+
+    raw, shaped = session_rows(args.sessions)
+    entries = tutor_entries(args.tutors)
+
+    # Both paths must produce the same document
+    assert json.loads(sessions_before(raw)) == json.loads(sessions_after(shaped))
+    assert json.loads(tutors_before(entries)) == json.loads(tutors_after(entries))
+
+    print(f"{'payload':<22} {'before':>11} {'after':>11} {'speedup':>8}")
+    report(f"{args.sessions} session rows", lambda: sessions_before(raw), lambda: sessions_after(shaped), args.number)
+    report(f"{args.tutors} tutor page", lambda: tutors_before(entries), lambda: tutors_after(entries), args.number)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Description: Measures GET /tutors/requests latency as the session table grows. A tutor
+# with a fixed number of pending requests is seeded next to an increasing volume of
+# other tutors' sessions; with the filtered, index-backed query the latency should stay
+# flat. Everything runs in one transaction against DATABASE_URL and is rolled back.
+#
+#   python -m scripts.bench_session_requests --sizes 1000 10000 100000 --repeat 20
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, time as dt_time, timedelta
+import orjson
+from sqlalchemy import insert, text
+from database.config import SessionLocal, get_engine
+from models import UserDetail, TutorDetail, StudentDetail, Session
+from router.session_request import view_session_requests
+
+def seed_user(db, role_model, **fields):
+    user_id = uuid.uuid4()
+    db.add(UserDetail(userid=user_id, name="Bench User", email=f"{user_id}@bench.local", datejoined=date.today()))
+    db.flush()
+    db.add(role_model(**{role_model.__mapper__.primary_key[0].name: user_id}, **fields))
+    db.flush()
+    return user_id
+
+def seed_sessions(db, tutor_id, student_id, count, status):
+    today = date.today()
+    rows = [
+        {
+            "session_id": uuid.uuid4(),
+            "date": today + timedelta(days=i % 365),
+            "time": dt_time(8 + i % 10, 0),
+            "tutor_id": tutor_id,
+            "student_id": student_id,
+            "status": status,
+            "modality": "online",
+        }
+        for i in range(count)
+    ]
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(Session), rows[start:start + 5000])
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /tutors/requests latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="total sessions of other tutors")
+    parser.add_argument("--pending", type=int, default=30, help="pending requests of the measured tutor")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal(bind=get_engine())
+    try:
+        tutor_id = seed_user(db, TutorDetail, description="Benchmark tutor", status=0)
+        other_tutor_id = seed_user(db, TutorDetail, description="Benchmark tutor", status=0)
+        student_id = seed_user(db, StudentDetail, student_number=f"bench-{uuid.uuid4().hex[:12]}", degree_program="BS")
+        seed_sessions(db, tutor_id, student_id, args.pending, status=0)
+
+        seeded = 0
+        print(f"{'sessions':>10} {'median':>10} {'p95':>10}")
+        for size in sorted(args.sizes):
+            seed_sessions(db, other_tutor_id, student_id, size - seeded, status=0)
+            seeded = size
+            db.execute(text("ANALYZE session"))
+
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = view_session_requests(limit=50, cursor=None, user={"user_id": tutor_id}, db=db)
+                timings.append(time.perf_counter() - started)
+            assert len(orjson.loads(response.body)) == min(args.pending, 50)
+
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{size + args.pending:>10} {statistics.median(timings) * 1000:>8.1f}ms {p95 * 1000:>8.1f}ms")
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    main()
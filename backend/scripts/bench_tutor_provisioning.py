@@ -0,0 +1,80 @@
+# Description: Measures create_tutor_profile latency for tutors with large metadata
+# lists against the configured DATABASE_URL. Every tutor it creates is removed again.
+#
+#   python -m scripts.bench_tutor_provisioning --items 10 50 200 --repeat 5
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+from sqlalchemy import delete
+from database.config import SessionLocal, get_engine
+from models import (
+    UserDetail, TutorDetail, TutorAffiliation, TutorAvailability, TutorExpertise, TutorSocials,
+    SubjectDetail, UserRoleDetail, TutorDirectory,
+)
+from router.auth.signup import create_tutor_profile
+
+def fake_tutor(items: int) -> SimpleNamespace:
+    today = date.today()
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_metadata={
+            "description": "Benchmark tutor",
+            "affiliation": [f"Org {i}" for i in range(items)],
+            "expertise": [f"Expertise {i}" for i in range(items)],
+            "socials": [f"https://example.com/{i}" for i in range(items)],
+            "availability": [(today + timedelta(days=i)).isoformat() for i in range(items)],
+            "available_time_from": ["09:00:00"] * items,
+            "available_time_to": ["17:00:00"] * items,
+            "subject": [f"Subject {i}" for i in range(items)],
+        },
+    )
+
+def cleanup(db, tutor_ids):
+    for model, column in (
+        (TutorDirectory, TutorDirectory.tutor_id),
+        (TutorAffiliation, TutorAffiliation.tutor_id),
+        (TutorAvailability, TutorAvailability.tutor_id),
+        (TutorExpertise, TutorExpertise.tutor_id),
+        (TutorSocials, TutorSocials.tutor_id),
+        (SubjectDetail, SubjectDetail.tutor_id),
+        (UserRoleDetail, UserRoleDetail.user_id),
+        (TutorDetail, TutorDetail.tutor_id),
+        (UserDetail, UserDetail.userid),
+    ):
+        db.execute(delete(model).where(column.in_(tutor_ids)))
+    db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description="create_tutor_profile latency benchmark")
+    parser.add_argument("--items", type=int, nargs="+", default=[5, 50, 200], help="rows per metadata list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal(bind=get_engine())
+    pending_status_id = 0
+    created = []
+    try:
+        print(f"{'items/list':>10} {'child rows':>11} {'median':>10} {'max':>10}")
+        for items in args.items:
+            timings = []
+            for _ in range(args.repeat):
+                user = fake_tutor(items)
+                db.add(UserDetail(userid=user.id, name="Bench Tutor", email=f"{user.id}@bench.local", datejoined=date.today()))
+                db.commit()
+                created.append(user.id)
+
+                started = time.perf_counter()
+                create_tutor_profile(user, db, pending_status_id)
+                timings.append(time.perf_counter() - started)
+
+            print(f"{items:>10} {items * 5:>11} {statistics.median(timings) * 1000:>8.1f}ms {max(timings) * 1000:>8.1f}ms")
+    finally:
+        db.rollback()
+        cleanup(db, created)
+        db.close()
+
+if __name__ == "__main__":
+    main()
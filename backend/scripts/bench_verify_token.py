@@ -0,0 +1,66 @@
+# Description: Micro-benchmark of the per-request cost of authentication, with the
+# verified-token cache on and off. Needs no database or Supabase access:
+#
+#   python -m scripts.bench_verify_token --iterations 20000
+import argparse
+import os
+import time
+
+# verify_token only needs the JWT secret; fill in the rest so settings load offline
+for name in ("SUPABASE_URL", "SUPABASE_KEY", "DATABASE_URL", "SUPABASE_SERVICE_ROLE_KEY", "BUCKET_NAME"):
+    os.environ.setdefault(name, "postgresql://bench@localhost/bench" if name == "DATABASE_URL" else "bench")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "bench-secret")
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from router import user_route
+
+def make_token() -> str:
+    claims = {
+        "sub": "00000000-0000-0000-0000-000000000001",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+        "user_metadata": {"role": ["0", "1"]},
+    }
+    return jwt.encode(claims, user_route.JWT_SECRET, algorithm=user_route.JWT_ALGORITHM)
+
+def time_calls(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+def run(iterations: int, cache_enabled: bool, token: str, client: TestClient) -> tuple[float, float]:
+    user_route.TOKEN_CACHE_ENABLED = cache_enabled
+    user_route.token_cache.clear()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    verify_us = time_calls(lambda: user_route.verify_token(token), iterations)
+    request_us = time_calls(lambda: client.get("/whoami", headers=headers), max(1, iterations // 10))
+    return verify_us, request_us
+
+def main():
+    parser = argparse.ArgumentParser(description="verify_token cache micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    app = FastAPI()
+
+    @app.get("/whoami")
+    def whoami(user=Depends(user_route.verify_token)):
+        return user
+
+    token = make_token()
+    with TestClient(app) as client:
+        off = run(args.iterations, False, token, client)
+        on = run(args.iterations, True, token, client)
+
+    print(f"{'':22}{'verify_token':>16}{'full request':>16}")
+    print(f"{'cache off':22}{off[0]:>13.1f} us{off[1]:>13.1f} us")
+    print(f"{'cache on':22}{on[0]:>13.1f} us{on[1]:>13.1f} us")
+    print(f"{'saved per request':22}{off[0] - on[0]:>13.1f} us{off[1] - on[1]:>13.1f} us")
+    print(f"\ncache stats: {user_route.token_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# Description: Query-plan regression check for the router hot paths. Seeds a realistic
+# volume of tutors, students, subjects and sessions inside one transaction, runs the read
+# handlers against it while capturing every statement they send, and EXPLAINs each one.
+# A sequential scan that filters a table larger than --max-seq-rows means a missing
+# index and fails the run. The transaction is rolled back, so it is safe to point at a
+# local development database:
+#
+#   python -m scripts.check_query_plans --tutors 2000 --students 5000 --sessions 200000
+#
+# Exits with status 1 when any plan regresses.
+import argparse
+import json
+import sys
+from datetime import date
+from sqlalchemy import event, select, text, tuple_
+from starlette.requests import Request
+from database.config import SessionLocal, get_engine
+from models import TutorDirectory
+from router.session_request import view_session_requests, get_student_accepted_requests, get_approved_requests, get_sessions, SessionExportFormat
+from router.tutor_route import get_students_for_tutor, get_tutor_requests
+from router.user_route import get_profile
+from services.tutor_directory import rebuild_tutor_directory
+from services.profile_loader import profile_cache
+
+SEED_STATEMENTS = [
+    "CREATE TEMP TABLE plan_tutors ON COMMIT DROP AS SELECT gen_random_uuid() AS id, g AS n FROM generate_series(1, :tutors) g",
+    "CREATE TEMP TABLE plan_students ON COMMIT DROP AS SELECT gen_random_uuid() AS id, g AS n FROM generate_series(1, :students) g",
+    """INSERT INTO user_detail (userid, name, email, datejoined)
+       SELECT id, 'Plan tutor ' || n, id || '@plan.local', current_date - n % 1000 FROM plan_tutors
+       UNION ALL
+       SELECT id, 'Plan student ' || n, id || '@plan.local', current_date - n % 1000 FROM plan_students""",
+    """INSERT INTO tutor_detail (tutor_id, description, status)
+       SELECT id, 'Plan tutor', CASE WHEN n % 20 = 0 THEN :pending ELSE :accepted END FROM plan_tutors""",
+    """INSERT INTO student_detail (student_id, student_number, degree_program)
+       SELECT id, 'plan-' || id, 'BS Plan' FROM plan_students""",
+    """INSERT INTO user_role_detail (user_id, role_id)
+       SELECT id, 1 FROM plan_tutors UNION ALL SELECT id, 0 FROM plan_students""",
+    """INSERT INTO tutor_affiliation (tutor_affiliation_id, tutor_id, affiliations)
+       SELECT gen_random_uuid(), id, 'Org ' || k FROM plan_tutors, generate_series(1, 3) k""",
+    """INSERT INTO tutor_expertise (tutor_expertise_id, tutor_id, expertise)
+       SELECT gen_random_uuid(), id, 'Expertise ' || (n + k) % 50 FROM plan_tutors, generate_series(1, 3) k""",
+    """INSERT INTO tutor_socials (tutor_socials_id, tutor_id, socials)
+       SELECT gen_random_uuid(), id, 'https://example.com/' || n || '/' || k FROM plan_tutors, generate_series(1, 3) k""",
+    """INSERT INTO tutor_availability (tutor_availability_id, tutor_id, availability, available_time_from, available_time_to)
+       SELECT gen_random_uuid(), id, current_date + k, '09:00', '17:00' FROM plan_tutors, generate_series(1, 3) k""",
+    """CREATE TEMP TABLE plan_topics ON COMMIT DROP AS
+       SELECT gen_random_uuid() AS subject_id, gen_random_uuid() AS topic_id, t.id AS tutor_id, t.n, k
+       FROM plan_tutors t, generate_series(1, 3) k""",
+    """INSERT INTO subject_detail (subject_id, subject_name, tutor_id)
+       SELECT subject_id, 'Subject ' || k, tutor_id FROM plan_topics""",
+    """INSERT INTO topic_detail (topic_id, subject_id, topic_title)
+       SELECT topic_id, subject_id, 'Topic ' || k FROM plan_topics""",
+    """INSERT INTO session (session_id, date, time, tutor_id, student_id, topic_id, status, modality)
+       SELECT gen_random_uuid(), current_date + g % 365, make_time(8 + g % 10, 0, 0),
+              p.tutor_id, s.id, p.topic_id,
+              CASE g % 10 WHEN 0 THEN :pending WHEN 1 THEN :accepted ELSE :other END, 'online'
+       FROM generate_series(1, :sessions) g
+       JOIN plan_topics p ON p.n = 1 + g % :tutors AND p.k = 1 + g % 3
+       JOIN plan_students s ON s.n = 1 + g % :students""",
+]
+
+def seed(db, args):
+    status_ids = db.execute(text("SELECT status_id FROM status_detail ORDER BY status_id")).scalars().all()
+    if not status_ids:
+        sys.exit("status_detail is empty; load the reference data first")
+    params = {
+        "tutors": args.tutors,
+        "students": args.students,
+        "sessions": args.sessions,
+        "pending": status_ids[0],
+        "accepted": status_ids[min(1, len(status_ids) - 1)],
+        "other": status_ids[-1],
+    }
+    for statement in SEED_STATEMENTS:
+        db.execute(text(statement), params)
+
+    rebuild_tutor_directory(db)
+    db.execute(text("ANALYZE"))
+
+    tutor_id, student_id = db.execute(text(
+        "SELECT (SELECT id FROM plan_tutors WHERE n = 1), (SELECT id FROM plan_students WHERE n = 1)"
+    )).one()
+    return tutor_id, student_id
+
+def router_checks(db, tutor_id, student_id):
+    """
+    (name, callable) pairs exercising each read path. The async tutor endpoints
+    run on a separate connection, so their statements are rebuilt here instead.
+    """
+    tutor = {"user_id": str(tutor_id), "role": ["1"]}
+    student = {"user_id": str(student_id), "role": ["0"]}
+    admin = {"user_id": str(tutor_id), "role": ["2"]}
+    # get_profile only reads headers (If-None-Match) from the request
+    request = Request({"type": "http", "headers": []})
+    directory = select(TutorDirectory).order_by(TutorDirectory.datejoined, TutorDirectory.tutor_id)
+    return [
+        ("GET /tutors/requests", lambda: view_session_requests(limit=50, cursor=None, user=tutor, db=db)),
+        ("GET /tutor/student-requests", lambda: get_students_for_tutor(user=tutor, db=db)),
+        ("GET /tutor-requests", lambda: get_tutor_requests(db=db)),
+        ("GET /sessions/accepted-requests", lambda: get_student_accepted_requests(user=tutor, db=db)),
+        ("GET /sessions/student", lambda: get_approved_requests(user=student, db=db)),
+        ("GET /sessions/admin", lambda: get_sessions(
+            date_from=None, date_to=None, limit=100, cursor=None, format=SessionExportFormat.JSON, user=admin, db=db
+        )),
+        ("GET /users/profile (tutor)", lambda: get_profile(request=request, user=tutor, db=db)),
+        ("GET /users/profile (student)", lambda: get_profile(request=request, user=student, db=db)),
+        ("GET /tutors", lambda: db.execute(directory.limit(11)).all()),
+        ("GET /tutors?cursor=", lambda: db.execute(
+            directory.where(tuple_(TutorDirectory.datejoined, TutorDirectory.tutor_id) > tuple_(date.today(), tutor_id)).limit(11)
+        ).all()),
+        ("GET /tutors?expertise_filter=", lambda: db.execute(
+            directory.where(TutorDirectory.expertise.contains(["Expertise 7"])).limit(11)
+        ).all()),
+        ("GET /tutors/{tutor_id}", lambda: db.execute(select(TutorDirectory).where(TutorDirectory.tutor_id == tutor_id)).all()),
+    ]
+
+def capture_statements(connection, call):
+    captured = []
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+    event.listen(connection, "before_cursor_execute", listener)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", listener)
+    return captured
+
+def walk(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+def seq_scan_violations(connection, statement, parameters, table_rows, max_rows):
+    plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    violations = []
+    for node in walk(plan[0]["Plan"]):
+        if node["Node Type"] != "Seq Scan" or "Filter" not in node:
+            continue
+        rows = table_rows.get(node["Relation Name"], 0)
+        if rows > max_rows:
+            violations.append(f"Seq Scan on {node['Relation Name']} ({rows} rows) filtered by {node['Filter']}")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the router queries against seeded data")
+    parser.add_argument("--tutors", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=200000)
+    parser.add_argument("--max-seq-rows", type=int, default=1000, help="largest table a filtered sequential scan may read")
+    args = parser.parse_args()
+
+    db = SessionLocal(bind=get_engine())
+    failures = 0
+    try:
+        tutor_id, student_id = seed(db, args)
+        profile_cache.clear()
+
+        connection = db.connection()
+        table_rows = dict(connection.execute(text(
+            "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        )).all())
+
+        for name, call in router_checks(db, tutor_id, student_id):
+            violations = []
+            for statement, parameters in capture_statements(connection, call):
+                violations += seq_scan_violations(connection, statement, parameters, table_rows, args.max_seq_rows)
+
+            print(f"{'FAIL' if violations else 'ok':>4}  {name}")
+            for violation in violations:
+                print(f"      {violation}")
+            failures += bool(violations)
+    finally:
+        db.rollback()
+        db.close()
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Description: Removes duplicate pending session requests so uq_session_pending_request
+# can be created. The old SELECT-then-INSERT check was racy, so a slot (tutor, student,
+# topic, date, time) may hold several pending rows. The lowest session_id of each slot is
+# kept; session_students rows of the others are moved onto it before they are deleted.
+# Run from the backend directory before applying the migration that adds the index:
+#
+#   python -m scripts.dedupe_pending_requests
+from sqlalchemy import text
+from database.config import SessionLocal, get_engine
+from models.session.session import PENDING_STATUS_ID
+
+DUPLICATES = """
+    CREATE TEMP TABLE pending_duplicates ON COMMIT DROP AS
+    SELECT session_id, kept_id FROM (
+        SELECT session_id,
+               first_value(session_id) OVER slot AS kept_id,
+               row_number() OVER slot AS n
+        FROM session
+        WHERE status = :pending
+        WINDOW slot AS (PARTITION BY tutor_id, student_id, topic_id, date, time ORDER BY session_id)
+    ) ranked
+    WHERE n > 1
+"""
+
+def main():
+    db = SessionLocal(bind=get_engine())
+    try:
+        # PARTITION BY groups NULL topics together, like the index's NULLS NOT DISTINCT
+        db.execute(text(DUPLICATES), {"pending": PENDING_STATUS_ID})
+        db.execute(text(
+            "UPDATE session_students s SET session_id = d.kept_id "
+            "FROM pending_duplicates d WHERE s.session_id = d.session_id"
+        ))
+        deleted = db.execute(text(
+            "DELETE FROM session WHERE session_id IN (SELECT session_id FROM pending_duplicates)"
+        )).rowcount
+        db.commit()
+        print(f"Removed {deleted} duplicate pending session requests")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
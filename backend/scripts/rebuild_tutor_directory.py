@@ -0,0 +1,21 @@
+# Description: Backfills or fully rebuilds the tutor_directory read model.
+# Run from the backend directory after creating the table or after editing
+# tutor data outside the API:  python -m scripts.rebuild_tutor_directory
+from database.config import SessionLocal, get_engine
+from services.tutor_directory import rebuild_tutor_directory
+from models import TutorDirectory
+
+def main():
+    db = SessionLocal(bind=get_engine())
+    try:
+        rebuild_tutor_directory(db)
+        db.commit()
+        print(f"tutor_directory rebuilt: {db.query(TutorDirectory).count()} tutors")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
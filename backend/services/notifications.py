@@ -0,0 +1,153 @@
+# Description: Push channel for session request events. Writers queue an event on their
+# database session; when the transaction commits it reaches every subscriber of the tutor
+# and the student involved. With the Postgres backplane enabled the events travel through
+# NOTIFY, which Postgres only delivers on commit, and every worker LISTENs and fans them
+# out to its own subscribers. Without it, events are fanned out in-process after commit.
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from threading import Lock
+from sqlalchemy import Text, event, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session as DBSession
+from constants import settings
+from constants.logger import logger
+
+SETTINGS = settings.get_settings()
+
+CHANNEL = "session_events"
+_PENDING_EVENTS = "pending_session_events"
+
+class SessionEventBroker:
+    """
+    In-process fan-out of events to per-user subscriber queues. Publishing is
+    thread safe, so sync handlers running in the threadpool can publish into
+    queues owned by the event loop.
+    """
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set] = defaultdict(set)
+        self._lock = Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[str(user_id)].add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers[str(user_id)].discard(subscriber)
+                if not self._subscribers[str(user_id)]:
+                    del self._subscribers[str(user_id)]
+
+    def publish(self, session_event: dict) -> None:
+        recipients = {str(session_event.get("tutor_id")), str(session_event.get("student_id"))}
+        with self._lock:
+            targets = [subscriber for user_id in recipients for subscriber in self._subscribers.get(user_id, ())]
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, session_event)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._subscribers),
+                "connections": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            }
+
+def _offer(queue: asyncio.Queue, session_event: dict) -> None:
+    # A subscriber that stopped reading loses events rather than growing without bound
+    try:
+        queue.put_nowait(session_event)
+    except asyncio.QueueFull:
+        logger.warning("Dropping session event for a slow subscriber")
+
+broker = SessionEventBroker()
+
+def publish_session_event(db, event_type: str, session_id, tutor_id, student_id, status=None) -> None:
+    """
+    Queue an event for delivery once `db` commits. Does not commit.
+    """
+    session_event = {
+        "type": event_type,
+        "session_id": str(session_id),
+        "tutor_id": str(tutor_id),
+        "student_id": str(student_id),
+        "status": status,
+    }
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault(_PENDING_EVENTS, []).append(session_event)
+
+@event.listens_for(DBSession, "before_commit")
+def _notify_pending(db):
+    if not SETTINGS.SESSION_EVENTS_BACKPLANE:
+        return
+    events = db.info.pop(_PENDING_EVENTS, None)
+    if events:
+        # One statement for the whole transaction; Postgres holds the notifications until commit
+        payloads = [json.dumps(session_event) for session_event in events]
+        payload = func.unnest(literal(payloads, ARRAY(Text))).column_valued("payload")
+        db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+@event.listens_for(DBSession, "after_commit")
+def _publish_committed(db):
+    for session_event in db.info.pop(_PENDING_EVENTS, ()):
+        broker.publish(session_event)
+
+@event.listens_for(DBSession, "after_soft_rollback")
+def _discard_pending(db, previous_transaction):
+    if previous_transaction.parent is None:
+        db.info.pop(_PENDING_EVENTS, None)
+
+def listener_dsn() -> str:
+    """
+    LISTEN needs a session-level connection, so a transaction-mode pooler URL
+    will not work here; SESSION_EVENTS_DATABASE_URL can point at a direct one.
+    """
+    url = make_url(SETTINGS.SESSION_EVENTS_DATABASE_URL or SETTINGS.DATABASE_URL)
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+_listener_task: asyncio.Task | None = None
+
+def ensure_listener() -> None:
+    """
+    Start this worker's LISTEN task on first use. No-op without the backplane.
+    """
+    global _listener_task
+    if not SETTINGS.SESSION_EVENTS_BACKPLANE:
+        return
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.get_running_loop().create_task(_listen())
+
+async def _listen(retry_delay: float = 1.0) -> None:
+    import asyncpg
+
+    def on_notify(connection, pid, channel, payload):
+        try:
+            broker.publish(json.loads(payload))
+        except ValueError:
+            logger.warning(f"Ignoring malformed session event: {payload}")
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(listener_dsn())
+            await connection.add_listener(CHANNEL, on_notify)
+            logger.info(f"Listening for {CHANNEL} notifications")
+            retry_delay = 1.0
+            # Block until the connection drops; asyncpg delivers notifications meanwhile
+            closed = asyncio.get_running_loop().create_future()
+            connection.add_termination_listener(lambda _: closed.done() or closed.set_result(None))
+            await closed
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Session event listener failed: {str(e)}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, 30.0)
@@ -0,0 +1,92 @@
+# Description: Loads everything GET /users/profile needs for the caller's roles in one
+# statement. Student and admin details are 1:1 outer joins and the tutor section comes
+# from the pre-aggregated tutor_directory row, so no join multiplies rows.
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session as DBSession
+from constants import settings
+from models import UserDetail, StudentDetail, AdminDetail, TutorDirectory
+from utils.cache import TTLCache, evict_on_commit
+
+SETTINGS = settings.get_settings()
+
+# Short-lived per-user cache; PROFILE_CACHE_TTL=0 turns it off
+profile_cache = TTLCache("user_profiles", maxsize=SETTINGS.PROFILE_CACHE_MAXSIZE, ttl=SETTINGS.PROFILE_CACHE_TTL)
+
+def evict_profile_on_commit(db, *user_ids) -> None:
+    """
+    Schedule eviction of the users' cached profiles once `db` commits.
+    """
+    evict_on_commit(db, profile_cache, *(str(user_id) for user_id in user_ids))
+
+def load_profile(db: DBSession, uid: str, role_ids: list[int]) -> Optional[dict]:
+    """
+    Build the profile response for `uid`, including only the sections of the
+    given roles. Returns None when the user does not exist.
+    """
+    role_key = tuple(sorted(role_ids))
+    cached = profile_cache.get(str(uid))
+    if cached is not None and cached[0] == role_key:
+        return cached[1]
+
+    columns = [UserDetail.name, UserDetail.email, UserDetail.datejoined, UserDetail.image_public_url]
+    query = select(*columns).where(UserDetail.userid == uid)
+
+    if 0 in role_ids:
+        query = query.outerjoin(StudentDetail, StudentDetail.student_id == UserDetail.userid)\
+            .add_columns(StudentDetail.student_id, StudentDetail.student_number, StudentDetail.degree_program)
+
+    if 1 in role_ids:
+        query = query.outerjoin(TutorDirectory, TutorDirectory.tutor_id == UserDetail.userid)\
+            .add_columns(
+                TutorDirectory.tutor_id,
+                TutorDirectory.description,
+                TutorDirectory.status,
+                TutorDirectory.affiliations,
+                TutorDirectory.expertise,
+                TutorDirectory.socials,
+                TutorDirectory.availability,
+                TutorDirectory.subject,
+            )
+
+    if 2 in role_ids:
+        query = query.outerjoin(AdminDetail, AdminDetail.admin_id == UserDetail.userid)\
+            .add_columns(AdminDetail.admin_id, AdminDetail.admin_role)
+
+    row = db.execute(query).first()
+    if row is None:
+        return None
+
+    response = {
+        "user": {
+            "name": row.name,
+            "email": row.email,
+            "datejoined": str(row.datejoined),
+            "image_public_url": row.image_public_url
+        }
+    }
+
+    if 0 in role_ids and row.student_id is not None:
+        response["student"] = {
+            "student_number": row.student_number,
+            "degree_program": row.degree_program
+        }
+
+    if 1 in role_ids and row.tutor_id is not None:
+        response["tutor"] = {
+            "description": row.description,
+            "status": row.status,
+            "affiliations": row.affiliations or [],
+            "expertise": row.expertise or [],
+            "socials": row.socials or [],
+            "availability": row.availability or [],
+            "subject": row.subject or []
+        }
+
+    if 2 in role_ids and row.admin_id is not None:
+        response["admin"] = {
+            "admin_role": row.admin_role
+        }
+
+    profile_cache.set(str(uid), (role_key, response))
+    return response
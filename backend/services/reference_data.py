@@ -0,0 +1,54 @@
+# Description: Process-wide registry of the status_detail and role_detail lookup tables.
+# Both are tiny and change only through manual edits, so they are loaded once and kept in
+# memory until REFERENCE_DATA_TTL expires or an admin triggers POST /system/reference-data/refresh.
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session as DBSession
+from constants import settings
+from constants.logger import logger
+from models import StatusDetail, RoleDetail
+from utils.cache import TTLCache
+
+SETTINGS = settings.get_settings()
+
+_SNAPSHOT = "snapshot"
+
+reference_cache = TTLCache("reference_data", maxsize=1, ttl=SETTINGS.REFERENCE_DATA_TTL)
+
+class ReferenceData(NamedTuple):
+    statuses: dict[int, str]         # status_id -> status
+    status_ids: dict[str, int]       # status -> status_id
+    roles: dict[int, str]            # role_id -> role_name
+
+def load_reference_data(db: DBSession) -> ReferenceData:
+    """
+    Read both lookup tables and replace the cached snapshot.
+    """
+    statuses = dict(db.execute(select(StatusDetail.status_id, StatusDetail.status)).all())
+    roles = dict(db.execute(select(RoleDetail.role_id, RoleDetail.role_name)).all())
+    data = ReferenceData(
+        statuses=statuses,
+        status_ids={status: status_id for status_id, status in statuses.items()},
+        roles=roles,
+    )
+    reference_cache.set(_SNAPSHOT, data)
+    logger.info(f"Loaded reference data: {len(statuses)} statuses, {len(roles)} roles")
+    return data
+
+def get_reference_data(db: DBSession) -> ReferenceData:
+    """
+    Return the cached snapshot, loading it through `db` when missing or expired.
+    """
+    data = reference_cache.get(_SNAPSHOT)
+    if data is None:
+        data = load_reference_data(db)
+    return data
+
+def get_status_id(db: DBSession, status: str) -> Optional[int]:
+    return get_reference_data(db).status_ids.get(status)
+
+def is_status(db: DBSession, status_id: int) -> bool:
+    return status_id in get_reference_data(db).statuses
+
+def is_role(db: DBSession, role_id: int) -> bool:
+    return role_id in get_reference_data(db).roles
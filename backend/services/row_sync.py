@@ -0,0 +1,74 @@
+# Description: Change-only writes for profile data. List sections of a tutor profile
+# (affiliation, availability, expertise, socials, subjects) are synced by diffing the
+# requested list against the stored rows, and scalar sections are only updated when a
+# value actually differs, so an unchanged save writes nothing.
+from collections import Counter
+from typing import NamedTuple
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as DBSession
+
+class SyncResult(NamedTuple):
+    inserted: int = 0
+    deleted: int = 0
+    updated: int = 0
+
+    @property
+    def touched(self) -> int:
+        return self.inserted + self.deleted + self.updated
+
+    def __add__(self, other: "SyncResult") -> "SyncResult":
+        return SyncResult(*(a + b for a, b in zip(self, other)))
+
+def bulk_insert(db: DBSession, model, rows: list[dict]) -> None:
+    """
+    Insert all rows with a single multi-row INSERT statement.
+    """
+    if rows:
+        db.execute(insert(model).values(rows))
+
+def sync_tutor_rows(db: DBSession, model, tutor_id, rows: list[dict], columns: tuple[str, ...]) -> SyncResult:
+    """
+    Make the tutor's rows of `model` equal to `rows`, compared on `columns`.
+
+    Rows are treated as a multiset: matching rows are left untouched, surplus
+    stored rows are deleted with one DELETE and missing ones are added with one
+    multi-row INSERT. Does not commit.
+    """
+    primary_key = model.__mapper__.primary_key[0]
+    value_columns = [getattr(model, name) for name in columns]
+
+    stored = db.execute(select(primary_key, *value_columns).where(model.tutor_id == tutor_id)).all()
+    wanted = Counter(tuple(row[name] for name in columns) for row in rows)
+
+    stale_ids = []
+    for stored_row in stored:
+        key = tuple(stored_row[1:])
+        if wanted[key] > 0:
+            wanted[key] -= 1
+        else:
+            stale_ids.append(stored_row[0])
+
+    if stale_ids:
+        db.execute(delete(model).where(primary_key.in_(stale_ids)))
+
+    missing = [
+        {"tutor_id": tutor_id, **dict(zip(columns, key))}
+        for key, count in wanted.items()
+        for _ in range(count)
+    ]
+    bulk_insert(db, model, missing)
+
+    return SyncResult(inserted=len(missing), deleted=len(stale_ids))
+
+def update_if_changed(db: DBSession, model, key_column, key, fields: dict) -> SyncResult:
+    """
+    UPDATE the row only when at least one field differs from the stored value,
+    so unchanged saves do not create a new row version. Does not commit.
+    """
+    if not fields:
+        return SyncResult()
+
+    changed = or_(*(getattr(model, name).is_distinct_from(value) for name, value in fields.items()))
+    result = db.execute(update(model).where(key_column == key, changed).values(**fields))
+    return SyncResult(updated=result.rowcount)
@@ -0,0 +1,16 @@
+# Description: In-process cache of serialized GET /tutors/{tutor_id} responses and their ETags.
+# Entries are evicted after any transaction that refreshed the tutor's directory row
+# commits, so a reader can never repopulate the cache with pre-commit data.
+from sqlalchemy.orm import Session as DBSession
+from constants import settings
+from utils.cache import TTLCache, evict_on_commit
+
+SETTINGS = settings.get_settings()
+
+tutor_cache = TTLCache("tutor_detail", maxsize=SETTINGS.TUTOR_CACHE_MAXSIZE, ttl=SETTINGS.TUTOR_CACHE_TTL)
+
+def evict_tutor_on_commit(db: DBSession, *tutor_ids) -> None:
+    """
+    Schedule cache eviction of the given tutors once `db` commits.
+    """
+    evict_on_commit(db, tutor_cache, *(str(tutor_id) for tutor_id in tutor_ids))
@@ -0,0 +1,61 @@
+# Description: Builds complete tutor cards in a single statement. Every multi-valued
+# attribute is collected by its own correlated array_agg subquery, so the result has
+# exactly one row per tutor no matter how many child rows each tutor has.
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from models import UserDetail, TutorDetail, TutorAffiliation, TutorAvailability, TutorExpertise, TutorSocials, SubjectDetail, TopicDetail
+
+def _aggregate(column, tutor_column, *order_by, where=()):
+    """
+    Correlated subquery that collects `column` for the outer tutor into an array.
+    """
+    return (
+        select(func.array_agg(aggregate_order_by(column, *(order_by or (column,)))))
+        .where(tutor_column == UserDetail.userid, *where)
+        .scalar_subquery()
+    )
+
+def _topic_aggregate(column):
+    return (
+        select(func.array_agg(aggregate_order_by(column, TopicDetail.topic_id)))
+        .select_from(TopicDetail)
+        .join(SubjectDetail, SubjectDetail.subject_id == TopicDetail.subject_id)
+        .where(SubjectDetail.tutor_id == UserDetail.userid, TopicDetail.topic_title.isnot(None))
+        .scalar_subquery()
+    )
+
+def tutor_card_columns(include_topics: bool = False) -> list:
+    # Availability arrays share one ordering so the three lists stay index-aligned
+    availability_order = (TutorAvailability.availability, TutorAvailability.available_time_from, TutorAvailability.tutor_availability_id)
+
+    columns = [
+        UserDetail.userid,
+        UserDetail.name,
+        UserDetail.email,
+        UserDetail.datejoined,
+        TutorDetail.description,
+        TutorDetail.status,
+        _aggregate(SubjectDetail.subject_name, SubjectDetail.tutor_id, SubjectDetail.subject_name, SubjectDetail.subject_id).label("subject"),
+        _aggregate(TutorAffiliation.affiliations, TutorAffiliation.tutor_id, where=(TutorAffiliation.affiliations.isnot(None),)).label("affiliations"),
+        _aggregate(TutorAvailability.availability, TutorAvailability.tutor_id, *availability_order).label("availability"),
+        _aggregate(TutorAvailability.available_time_from, TutorAvailability.tutor_id, *availability_order).label("available_time_from"),
+        _aggregate(TutorAvailability.available_time_to, TutorAvailability.tutor_id, *availability_order).label("available_time_to"),
+        _aggregate(TutorExpertise.expertise, TutorExpertise.tutor_id).label("expertise"),
+        _aggregate(TutorSocials.socials, TutorSocials.tutor_id, where=(TutorSocials.socials.isnot(None),)).label("socials"),
+    ]
+
+    if include_topics:
+        columns += [
+            _topic_aggregate(TopicDetail.topic_title).label("topic_title"),
+            _topic_aggregate(TopicDetail.topic_id).label("topic_id"),
+        ]
+
+    return columns
+
+def tutor_card_select(include_topics: bool = False):
+    """
+    One fully populated tutor card per row.
+    """
+    return select(*tutor_card_columns(include_topics))\
+        .select_from(UserDetail)\
+        .join(TutorDetail, TutorDetail.tutor_id == UserDetail.userid)
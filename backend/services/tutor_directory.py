@@ -0,0 +1,98 @@
+# Description: Maintains the tutor_directory read model. Writers call
+# refresh_tutor_directory for the tutors they touched, inside their own transaction,
+# and the directory endpoints read from the table with a single indexed scan.
+from uuid import UUID
+from sqlalchemy import delete, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as DBSession
+from models import TutorDirectory, TutorDirectoryVersion, TutorDetail, UserDetail
+from .tutor_cards import tutor_card_select
+from .tutor_cache import tutor_cache, evict_tutor_on_commit
+from .profile_loader import profile_cache, evict_profile_on_commit
+
+# Directory columns in the same order as tutor_card_select(include_topics=True)
+_DIRECTORY_COLUMNS = [
+    "tutor_id", "name", "email", "datejoined", "description", "status",
+    "subject", "affiliations", "availability", "available_time_from", "available_time_to",
+    "expertise", "socials", "topic_title", "topic_id", "updated_at",
+]
+
+def _upsert_from_cards(card_select):
+    source = card_select.add_columns(func.now())
+    stmt = insert(TutorDirectory).from_select(_DIRECTORY_COLUMNS, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[TutorDirectory.tutor_id],
+        set_={name: stmt.excluded[name] for name in _DIRECTORY_COLUMNS if name != "tutor_id"},
+    )
+
+def _bump_version(db: DBSession) -> None:
+    # Row-level upsert: concurrent refreshes queue on the row lock until the holder commits
+    stmt = insert(TutorDirectoryVersion).values(id=1, version=1)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[TutorDirectoryVersion.id],
+        set_={"version": TutorDirectoryVersion.version + 1},
+    ))
+
+def refresh_tutor_directory(db: DBSession, *tutor_ids) -> None:
+    """
+    Rebuild the directory rows of the given tutors from the source tables.
+
+    Runs as INSERT ... SELECT ... ON CONFLICT so no tutor data travels through
+    Python. Does not commit; the caller's transaction makes the refresh atomic
+    with the write that caused it.
+    """
+    ids = [UUID(str(tutor_id)) for tutor_id in tutor_ids]
+    if not ids:
+        return
+
+    # Pending ORM changes must be visible to the INSERT ... SELECT below
+    db.flush()
+
+    db.execute(_upsert_from_cards(tutor_card_select(include_topics=True).where(UserDetail.userid.in_(ids))))
+
+    # Drop rows of users that are no longer tutors
+    db.execute(
+        delete(TutorDirectory)
+        .where(TutorDirectory.tutor_id.in_(ids))
+        .where(~exists().where(TutorDetail.tutor_id == TutorDirectory.tutor_id))
+    )
+
+    _bump_version(db)
+
+    # Tutor profiles are read from the directory row as well
+    evict_tutor_on_commit(db, *ids)
+    evict_profile_on_commit(db, *ids)
+
+def rebuild_tutor_directory(db: DBSession) -> None:
+    """
+    Rebuild the whole directory, e.g. after a backfill or out-of-band edits
+    to topics made directly in Supabase. Does not commit.
+    """
+    db.flush()
+    db.execute(_upsert_from_cards(tutor_card_select(include_topics=True)))
+    db.execute(delete(TutorDirectory).where(~exists().where(TutorDetail.tutor_id == TutorDirectory.tutor_id)))
+    _bump_version(db)
+    tutor_cache.clear()
+    profile_cache.clear()
+
+def directory_entry_to_card(entry) -> dict:
+    """
+    Shape a TutorDirectory row like TutorResponse.
+    """
+    return {
+        "userid": entry.tutor_id,
+        "name": entry.name,
+        "email": entry.email,
+        "datejoined": entry.datejoined,
+        "subject": entry.subject or [],
+        "topic_title": entry.topic_title or [],
+        "topic_id": entry.topic_id or [],
+        "description": entry.description,
+        "status": str(entry.status) if entry.status is not None else None,
+        "affiliations": entry.affiliations or [],
+        "availability": entry.availability or [],
+        "available_time_from": entry.available_time_from or [],
+        "available_time_to": entry.available_time_to or [],
+        "expertise": entry.expertise or [],
+        "socials": entry.socials or [],
+    }
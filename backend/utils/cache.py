@@ -0,0 +1,103 @@
+# Description: Small in-process LRU cache with per-entry expiry, used for data that is
+# cheap to keep in memory but expensive to recompute on every request.
+import time
+from collections import OrderedDict
+from threading import Lock
+from sqlalchemy import event
+from sqlalchemy.orm import Session as DBSession
+
+_MISSING = object()
+_PENDING_EVICTIONS = "pending_cache_evictions"
+
+# Every cache registers itself here so its counters can be reported in one place.
+_registry: dict[str, "TTLCache"] = {}
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after `ttl` seconds.
+
+    The cache is per process: on Lambda each warm container holds its own copy,
+    so the TTL bounds how stale an entry can get on containers that did not see
+    an invalidation.
+    """
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float | None = None):
+        """
+        Store a value. `ttl` overrides the cache default for this entry only.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+def cache_stats() -> dict:
+    """
+    Counters of every cache created in this process, keyed by cache name.
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+def evict_on_commit(db, cache: TTLCache, *keys) -> None:
+    """
+    Evict `keys` from `cache` once the transaction of `db` commits, so a
+    concurrent reader can never repopulate the cache with pre-commit data.
+    Accepts both sync and async sessions. Pending evictions are dropped on rollback.
+    """
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault(_PENDING_EVICTIONS, []).extend((cache, key) for key in keys)
+
+@event.listens_for(DBSession, "after_commit")
+def _evict_committed(db):
+    for cache, key in db.info.pop(_PENDING_EVICTIONS, ()):
+        cache.pop(key)
+
+@event.listens_for(DBSession, "after_soft_rollback")
+def _discard_pending(db, previous_transaction):
+    if previous_transaction.parent is None:
+        db.info.pop(_PENDING_EVICTIONS, None)
@@ -0,0 +1,67 @@
+# Description: Strategies for computing the `total` of paginated listings. Counting
+# the full filtered query costs about as much as fetching the page itself, so callers
+# can pick a cheaper mode per request.
+from enum import Enum
+from typing import Optional
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from constants import settings
+from constants.logger import logger
+from .cache import TTLCache
+
+SETTINGS = settings.get_settings()
+
+class CountMode(str, Enum):
+    EXACT = "exact"          # COUNT(*) of the filtered query, cached per filter combination
+    ESTIMATED = "estimated"  # planner row estimate; only used for unfiltered listings
+    NONE = "none"            # skip counting, clients page with has_more/next_cursor
+
+count_cache = TTLCache("listing_counts", maxsize=512, ttl=SETTINGS.COUNT_CACHE_TTL)
+
+async def resolve_total(
+    db: AsyncSession,
+    stmt: Select,
+    mode: CountMode,
+    cache_key: tuple,
+    estimate_table: str,
+    filtered: bool,
+) -> Optional[int]:
+    """
+    Return the total row count for a listing according to `mode`.
+
+    `cache_key` identifies the listing and its filters, `estimate_table` is the
+    table whose planner statistics approximate the unfiltered listing size.
+    Filtered listings always fall back to an exact count because table-level
+    statistics say nothing about how many rows match a filter.
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    if mode == CountMode.ESTIMATED and not filtered:
+        estimate = await estimate_count(db, estimate_table)
+        if estimate is not None:
+            return estimate
+
+    total = count_cache.get(cache_key)
+    if total is None:
+        total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        count_cache.set(cache_key, total)
+    return total
+
+async def estimate_count(db: AsyncSession, table: str) -> Optional[int]:
+    """
+    Read the planner's row estimate for `table` from pg_class. Returns None when
+    the table has never been analyzed and no estimate exists yet.
+    """
+    try:
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+    except Exception as e:
+        logger.warning(f"Could not read planner estimate for {table}: {str(e)}")
+        return None
+
+    if reltuples is None or reltuples < 0:
+        return None
+    return int(reltuples)
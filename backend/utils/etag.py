@@ -0,0 +1,40 @@
+# Description: Helpers for conditional GETs. Handlers derive a strong ETag from a version
+# or the response bytes, and answer a matching If-None-Match with 304 before doing the
+# expensive part of the request.
+import hashlib
+from fastapi import Request, Response
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag over the given parts. Bytes are hashed as-is, anything else by its str().
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match covers `etag`. Uses the weak comparison
+    RFC 9110 prescribes for If-None-Match, so W/ prefixes are ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+def validator_headers(etag: str, cache_control: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, cache_control))
+
+def conditional_response(request: Request, content: bytes, etag: str, cache_control: str) -> Response:
+    """
+    304 when the client already holds `etag`, otherwise the JSON body with validators.
+    """
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(content=content, media_type="application/json", headers=validator_headers(etag, cache_control))
@@ -0,0 +1,46 @@
+# Description: Helpers for keyset (cursor) pagination. A cursor is an opaque, URL-safe
+# token that encodes the sort key of the last row of the previous page.
+import base64
+import json
+from datetime import date, time
+from uuid import UUID
+from fastapi import HTTPException
+from constants.logger import logger
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+    """
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor back into typed values.
+    Raises a 400 if the cursor is malformed or does not match the expected key.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor key length mismatch")
+        return tuple(_from_json(v, t) for v, t in zip(values, types))
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid pagination cursor: {str(e)}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _to_json(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+def _from_json(value, type_):
+    if type_ is date:
+        return date.fromisoformat(value)
+    if type_ is time:
+        return time.fromisoformat(value)
+    if type_ is UUID:
+        return UUID(value)
+    return type_(value)
@@ -4,6 +4,12 @@ import { api } from '@/utils/axios';
 import { useEffect, useState } from 'react';
 import AdminSidebar from '../components/AdminSidebar';
 
+type AdminSessionPage = {
+  session: AdminSessionTracking[];
+  has_more: boolean;
+  next_cursor: string | null;
+};
+
 const AdminSessionTracking = () => {
   const [, setSidebarOpen] = useState(true);
   const [session, setSession] = useState<AdminSessionTracking[]>([]);
@@ -29,10 +35,17 @@ const AdminSessionTracking = () => {
   const fetchSession = async () => {
     setLoading(true);
     try {
-      const response = await api.get<{ session: AdminSessionTracking[] }>(
-        '/sessions/admin',
-      );
-      const session = response.data.session;
+      // The ledger is paged; follow next_cursor until every session is loaded
+      const session: AdminSessionTracking[] = [];
+      let cursor: string | null = null;
+      do {
+        const response: { data: AdminSessionPage } = await api.get<AdminSessionPage>(
+          '/sessions/admin',
+          { params: { limit: 500, ...(cursor ? { cursor } : {}) } },
+        );
+        session.push(...response.data.session);
+        cursor = response.data.has_more ? response.data.next_cursor : null;
+      } while (cursor);
       setSession(session);
       console.log(session);
     } catch (error) {
@@ -24,7 +24,11 @@ const Tutors = () => {
 
       setTutors(response.data.tutors);
 
-      setTotalPages(Math.ceil(response.data.total / response.data.limit));
+      setTotalPages(
+        response.data.total === null
+          ? response.data.page + (response.data.has_more ? 1 : 0)
+          : Math.ceil(response.data.total / response.data.limit),
+      );
       setPage(response.data.page);
     } catch (error) {
       console.error('Error fetching tutors:', error);
@@ -78,9 +78,11 @@ export interface StudentDetail {
 
 export interface TutorResponse {
   tutors: TutorDetail[];
-  total: number;
+  total: number | null;
   page: number;
   limit: number;
+  has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface StudentResponse {